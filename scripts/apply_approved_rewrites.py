@@ -4,12 +4,17 @@ from __future__ import annotations
 import argparse
 import csv
 import re
-from collections import Counter
+from bisect import bisect_right
+from collections import Counter, defaultdict
 from pathlib import Path
+from typing import Callable, Iterable, Sequence, TextIO
 
-LATIN_TOKEN_RE = re.compile(r"[A-Za-zĀāĪīŪūṚṛṜṝḶḷḸḹṄṅÑñṬṭḌḍṆṇŚśṢṣḤḥṂṃṀṁŹźÄÖÜäöüßışŞņŅãÃ]+(?:-[A-Za-zĀāĪīŪūṚṛṜṝḶḷḸḹṄṅÑñṬṭḌḍṆṇŚśṢṣḤḥṂṃṀṁŹźÄÖÜäöüßışŞņŅãÃ]+)*")
-APOSTROPHES = {"'", "’"}
+LATIN_CLASS = r"[A-Za-zĀāĪīŪūṚṛṜṝḶḷḸḹṄṅÑñṬṭḌḍṆṇŚśṢṣḤḥṂṃṀṁŹźÄÖÜäöüßışŞņŅãÃ]"
+LATIN_TOKEN_RE = re.compile(rf"{LATIN_CLASS}+(?:-{LATIN_CLASS}+)*")
+APOSTROPHES = frozenset("'’")
 NEXT_SYLLABLE_SKIP = re.compile(r"^[\s/\-–—~\.,;:!?\"“”()\[\]{}]*([A-Za-zĀāĪīŪūṚṛṜṝḶḷḸḹṄṅÑñṬṭḌḍṆṇŚśṢṣḤḥṂṃṀṁŹźÄÖÜäöüßışŞņŅãÃ]+)")
+NEWLINE_RE = re.compile(r"\n")
+TIBETAN_SCRIPT_RE = re.compile(r"[\u0F00-\u0FFF]")
 GAN_BLOCK_HINTS = ("türk.-mong.", "turk.-mong.", "qayan")
 GAN_BLOCK_PATTERNS = (
     re.compile(r"\bna\s+gan\s+s[āa]n\b", re.IGNORECASE),
@@ -38,25 +43,69 @@ def load_rewrites(path: Path) -> tuple[dict[str, str], list[tuple[str, str, str]
     return rewrites, conflicts
 
 
-def apply_text(text: str, rewrites: dict[str, str]) -> tuple[str, Counter[tuple[str, str]]]:
+def _trie_pattern(words: list[str]) -> str:
+    """Render words as a prefix-factored alternation so the engine never retries shared prefixes."""
+    trie: dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def render(node: dict[str, dict]) -> str:
+        optional = "" in node
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if optional:
+            if len(branches) == 1 and len(body) > 1:
+                body = f"(?:{body})"
+            body += "?"
+        return body
+
+    return render(trie)
+
+
+def compile_rewrite_matcher(rewrites: dict[str, str]) -> re.Pattern[str] | None:
+    """Match only approved source tokens, with the same token boundaries as LATIN_TOKEN_RE.
+
+    The engine scans in C and only calls back into Python on an actual keyword hit, instead of
+    once per Latin token in the text. Rewrites stay token-level even when both sides are a single
+    character: ``a -> ā`` must only touch a standalone ``a`` token, so the pairs cannot be folded
+    into a ``str.translate`` table.
+    """
+    keys = [src for src in rewrites if LATIN_TOKEN_RE.fullmatch(src)]
+    if not keys:
+        return None
+    return re.compile(
+        rf"(?<!{LATIN_CLASS})(?<!{LATIN_CLASS}-)"
+        rf"{_trie_pattern(keys)}"
+        rf"(?!{LATIN_CLASS})(?!-{LATIN_CLASS})"
+    )
+
+
+def apply_text(
+    text: str, rewrites: dict[str, str], matcher: re.Pattern[str] | None = None
+) -> tuple[str, Counter[tuple[str, str]]]:
     counts: Counter[tuple[str, str]] = Counter()
 
-    def get_line_bounds(full: str, start: int, end: int) -> tuple[int, int]:
-        line_start = full.rfind("\n", 0, start) + 1
-        line_end = full.find("\n", end)
-        if line_end < 0:
-            line_end = len(full)
-        return line_start, line_end
+    # Line-scoped guardrail verdicts keyed by line start; several hits often share a line.
+    line_blocked: dict[int, bool] = {}
 
-    def should_skip_rewrite(tok: str, dst: str, full: str, start: int, end: int) -> bool:
-        # Conservative guardrails for known risky pair: gan -> gaṅ.
-        if tok != "gan" or dst != "gaṅ":
-            return False
+    # Sentinel-wrapped newline offsets, built on the first guarded hit.
+    newlines: list[int] = []
 
-        line_start, line_end = get_line_bounds(full, start, end)
-        line_text = full[line_start:line_end]
+    def get_line_bounds(full: str, start: int, end: int) -> tuple[int, int]:
+        if not newlines:
+            newlines.append(-1)
+            newlines.extend(m.start() for m in NEWLINE_RE.finditer(full))
+            newlines.append(len(full))
+        i = bisect_right(newlines, start - 1) - 1
+        return newlines[i] + 1, newlines[i + 1]
+
+    def line_blocks_gan(line_text: str) -> bool:
         line_lc = line_text.lower()
-
         # If Tibetan source line has གན, keep Latin "gan" rather than forcing "gaṅ".
         if "གན" in line_text:
             return True
@@ -66,7 +115,21 @@ def apply_text(text: str, rewrites: dict[str, str]) -> tuple[str, Counter[tuple[
             return True
         # Very conservative: in skt-reference lines without Tibetan script,
         # "gan" at line-wrap boundaries is ambiguous; leave unchanged.
-        if "skt." in line_lc and not re.search(r"[\u0F00-\u0FFF]", line_text):
+        if "skt." in line_lc and not TIBETAN_SCRIPT_RE.search(line_text):
+            return True
+        return False
+
+    def should_skip_rewrite(tok: str, dst: str, full: str, start: int, end: int) -> bool:
+        # Conservative guardrails for known risky pair: gan -> gaṅ.
+        if tok != "gan" or dst != "gaṅ":
+            return False
+
+        line_start, line_end = get_line_bounds(full, start, end)
+        blocked = line_blocked.get(line_start)
+        if blocked is None:
+            blocked = line_blocks_gan(full[line_start:line_end])
+            line_blocked[line_start] = blocked
+        if blocked:
             return True
 
         prev_char = full[start - 1] if start > 0 else ""
@@ -82,20 +145,55 @@ def apply_text(text: str, rewrites: dict[str, str]) -> tuple[str, Counter[tuple[
                 return True
         return False
 
+    # Every hit of the matcher is an approved source token, so count by source token alone and
+    # pair each with its target once at the end; hot-path lookups are bound to locals.
+    hits: defaultdict[str, int] = defaultdict(int)
+    rewrite_for = rewrites.get
+    skip = should_skip_rewrite
+
     def repl(m: re.Match[str]) -> str:
         tok = m.group(0)
-        dst = rewrites.get(tok)
+        dst = rewrite_for(tok)
         if not dst:
             return tok
-        if should_skip_rewrite(tok, dst, text, m.start(), m.end()):
+        if tok == "gan" and skip(tok, dst, text, m.start(), m.end()):
             return tok
-        counts[(tok, dst)] += 1
+        hits[tok] += 1
         return dst
 
-    out = LATIN_TOKEN_RE.sub(repl, text)
+    if not rewrites:
+        return text, counts
+    if matcher is None:
+        matcher = compile_rewrite_matcher(rewrites)
+    if matcher is None:
+        return text, counts
+    out = matcher.sub(repl, text)
+    for tok, n in hits.items():
+        counts[(tok, rewrites[tok])] = n
     return out, counts
 
 
+def tsv_row_writer(f: TextIO) -> Callable[[Iterable[Sequence[str]]], None]:
+    """Return a rows writer whose output is byte-identical to csv.writer(f, delimiter="\\t").
+
+    Most rows are plain text, so they are tab-joined and written directly; only a row that csv
+    would quote (a quote, tab or line break inside a field, or a lone empty field) goes through
+    the csv writer.
+    """
+    quoted = csv.writer(f, delimiter="\t")
+    write = f.write
+
+    def write_rows(rows: Iterable[Sequence[str]]) -> None:
+        for row in rows:
+            line = "\t".join(row)
+            if not line or '"' in line or "\r" in line or "\n" in line or line.count("\t") != len(row) - 1:
+                quoted.writerow(row)
+            else:
+                write(line + "\r\n")
+
+    return write_rows
+
+
 def main() -> None:
     ap = argparse.ArgumentParser(description="Apply only explicit approved token rewrite pairs to OCR text.")
     ap.add_argument("--approved", required=True, help="TSV with at least from_token and to_token columns.")
@@ -108,6 +206,7 @@ def main() -> None:
     outdir.mkdir(parents=True, exist_ok=True)
 
     rewrites, conflicts = load_rewrites(approved_path)
+    matcher = compile_rewrite_matcher(rewrites)
     if conflicts:
         conflict_path = outdir / "rewrite_conflicts.tsv"
         with conflict_path.open("w", encoding="utf-8", newline="") as f:
@@ -118,25 +217,24 @@ def main() -> None:
 
     summary_path = outdir / "apply_summary.tsv"
     with summary_path.open("w", encoding="utf-8", newline="") as sf:
-        sw = csv.writer(sf, delimiter="\t")
-        sw.writerow(["input_file", "output_file", "replacements", "distinct_pairs"])
+        write_summary = tsv_row_writer(sf)
+        write_summary([["input_file", "output_file", "replacements", "distinct_pairs"]])
 
         global_counts: Counter[tuple[str, str]] = Counter()
         for ip in [Path(x) for x in args.inputs]:
             text = ip.read_text(encoding="utf-8", errors="replace")
-            out_text, counts = apply_text(text, rewrites)
+            out_text, counts = apply_text(text, rewrites, matcher)
             op = outdir / ip.name
             op.write_text(out_text, encoding="utf-8")
             rep = sum(counts.values())
-            sw.writerow([str(ip), str(op), rep, len(counts)])
+            write_summary([[str(ip), str(op), str(rep), str(len(counts))]])
             global_counts.update(counts)
 
     detail_path = outdir / "apply_replacements_detail.tsv"
-    with detail_path.open("w", encoding="utf-8", newline="") as f:
-        w = csv.writer(f, delimiter="\t")
-        w.writerow(["from_token", "to_token", "count"])
-        for (src, dst), c in global_counts.most_common():
-            w.writerow([src, dst, c])
+    with detail_path.open("w", encoding="utf-8", newline="", buffering=1 << 20) as f:
+        write_detail = tsv_row_writer(f)
+        write_detail([["from_token", "to_token", "count"]])
+        write_detail([src, dst, str(c)] for (src, dst), c in global_counts.most_common())
 
     print(f"approved_pairs={len(rewrites)}")
     print(f"summary={summary_path}")
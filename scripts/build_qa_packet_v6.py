@@ -3,8 +3,18 @@ from __future__ import annotations
 
 import argparse
 import csv
+import mmap
+import os
 import re
+import shutil
+import sys
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
+from typing import Callable, Iterable, Sequence
 
 SAMPLE_PER_VOLUME = 20
 
@@ -42,55 +52,133 @@ PAREN_RE = re.compile(r"\([^)]{0,120}\)")
 REF_FRAGMENT_RE = re.compile(
     r"\b(?:[A-Z][A-Za-z]{0,8}\d*[a-z]?|[A-Z]{1,5})\s+\d+[a-z]?(?:,\d+|[ab]\d+)?\b"
 )
+ABS_OFFSET_RE = re.compile(r"_(\d+)-(\d+)_")
 GARBAGE_TOKEN_RE = re.compile(r"^(?:\d{3,}|(?=.*\d)[0-9%/:)\(]{3,}|[7/%:]{3,})$")
 
 
+def char_class(chars: frozenset[str]) -> str:
+    """Render ``chars`` as a regex class of code-point ranges; re is far slower on long literal lists."""
+    cps = sorted(map(ord, chars))
+    parts = []
+    start = prev = cps[0]
+    for cp in cps[1:] + [-1]:
+        if cp == prev + 1:
+            prev = cp
+            continue
+        parts.append(re.escape(chr(start)) if start == prev else f"{re.escape(chr(start))}-{re.escape(chr(prev))}")
+        start = prev = cp
+    return "[" + "".join(parts) + "]"
+
+
+@lru_cache(maxsize=None)
+def garbage_chars() -> tuple[frozenset[str], frozenset[str], re.Pattern[str]]:
+    """Return (ratio chars, token chars, garbage-char pattern), built on first use.
+
+    Collecting the str.isdigit() characters scans every code point, too slow to do at import.
+    Ratio chars are what token_garbage_ratio counts as bad (isdigit is wider than 0-9); only
+    tokens made entirely of token chars (\\d is Unicode Nd) can match GARBAGE_TOKEN_RE. Every
+    garbage-row path needs a ratio char, and citation stripping only removes characters, so
+    lines the pattern does not match skip the garbage checks.
+    """
+    digits = [chr(c) for c in range(sys.maxunicode + 1) if chr(c).isdigit()]
+    ratio_chars = frozenset("".join(digits) + "%/:)()[]{}")
+    token_chars = frozenset("".join(c for c in digits if c.isdecimal()) + "%/:)(")
+    return ratio_chars, token_chars, re.compile(char_class(ratio_chars))
+
+
 def stratified_pages(total_pages: int, count: int) -> list[int]:
     if total_pages <= 0:
         return []
     if count >= total_pages:
         return list(range(1, total_pages + 1))
-    pages = []
-    for i in range(count):
-        pos = 1 + round(i * (total_pages - 1) / (count - 1))
-        pages.append(pos)
-    # Preserve order while removing duplicates.
-    out = []
-    seen = set()
-    for p in pages:
-        if p not in seen:
-            out.append(p)
-            seen.add(p)
-    return out
+    span = total_pages - 1
+    denom = count - 1
+    # dict.fromkeys preserves order while removing duplicates.
+    return list(dict.fromkeys(1 + round(i * span / denom) for i in range(count)))
 
 
 def parse_abs_offset(name: str) -> int | None:
-    m = re.search(r"_(\d+)-(\d+)_", name)
+    m = ABS_OFFSET_RE.search(name)
     if not m:
         return None
     return int(m.group(1)) - 1
 
 
+def page_spans(buf: bytes | mmap.mmap) -> list[tuple[int, int]]:
+    """Return (start, end) byte offsets of the form-feed separated pages without copying them.
+
+    A form feed byte never occurs inside a multi-byte UTF-8 sequence, so splitting the raw
+    bytes gives the same pages as splitting the decoded text.
+    """
+    spans: list[tuple[int, int]] = []
+    start = 0
+    while (ff := buf.find(b"\f", start)) >= 0:
+        spans.append((start, ff))
+        start = ff + 1
+    spans.append((start, len(buf)))
+    return spans
+
+
+def read_sampled_pages(path: Path, count: int) -> tuple[list[int], dict[int, str]]:
+    """Memory-map ``path`` and decode only the stratified sample of its pages."""
+    with path.open("rb") as f:
+        if f.seek(0, 2) == 0:
+            return stratified_pages(1, count), {1: ""}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            spans = page_spans(mm)
+            pages = stratified_pages(len(spans), count)
+            page_texts = {}
+            for p in pages:
+                start, end = spans[p - 1]
+                page = mm[start:end].decode("utf-8", errors="replace")
+                # Match the universal-newline translation of a text-mode read.
+                page_texts[p] = page.replace("\r\n", "\n").replace("\r", "\n")
+    return pages, page_texts
+
+
 def write_selected_pages(
-    text: str, pages: list[int], out_txt: Path, volume_label: str, abs_offset: int | None
+    page_texts: dict[int, str], pages: list[int], out_txt: Path, volume_label: str, abs_offset: int | None
 ) -> None:
-    chunks = text.split("\f")
     with out_txt.open("w", encoding="utf-8") as f:
         for p in pages:
-            if p < 1 or p > len(chunks):
+            if p not in page_texts:
                 continue
             abs_page = (abs_offset + p) if abs_offset is not None else p
             f.write(f"===== {volume_label} page_rel={p} page_abs={abs_page} =====\n")
-            f.write(chunks[p - 1].rstrip() + "\n\n")
+            f.write(page_texts[p].rstrip() + "\n\n")
 
 
 def token_garbage_ratio(tok: str) -> float:
     if not tok:
         return 0.0
-    bad = sum(1 for c in tok if c.isdigit() or c in "%/:)()[]{}")
+    bad = sum(map(garbage_chars()[0].__contains__, tok))
     return bad / len(tok)
 
 
+def is_garbage_token(tok: str) -> bool:
+    # The set check rejects ordinary words in C before the regex runs.
+    return len(tok) >= 3 and garbage_chars()[1].issuperset(tok) and bool(GARBAGE_TOKEN_RE.match(tok))
+
+
+def flagged_lines(page: str, line_starts: list[int], pattern: re.Pattern[str]) -> set[int]:
+    """Return 1-based numbers of lines containing a match, scanning the page rather than each line.
+
+    Only valid for patterns whose matches cannot cross a line break and whose edge assertions
+    see a line break the same way as the start/end of a stripped line.
+    """
+    found: set[int] = set()
+    pos = 0
+    search = pattern.search
+    while (m := search(page, pos)) is not None:
+        ln = bisect_right(line_starts, m.start())
+        found.add(ln)
+        if ln >= len(line_starts):
+            break
+        # Resume at the next line: one hit is enough to flag this one.
+        pos = line_starts[ln]
+    return found
+
+
 def strip_citation_like_spans(s: str) -> str:
     """Remove common citation fragments so digit-garbage checks focus on entry text."""
     out = PAREN_RE.sub(" ", s)
@@ -99,45 +187,61 @@ def strip_citation_like_spans(s: str) -> str:
 
 
 def collect_candidates(
-    text: str, pages: list[int], volume_label: str, abs_offset: int | None
+    page_texts: dict[int, str], pages: list[int], volume_label: str, abs_offset: int | None
 ) -> tuple[list[list[str]], list[list[str]], list[list[str]], list[list[str]]]:
-    chunks = text.split("\f")
     n_dot_rows: list[list[str]] = []
     sanskrit_rows: list[list[str]] = []
     garbage_rows: list[list[str]] = []
     garbage_high_rows: list[list[str]] = []
     for p in pages:
-        if p < 1 or p > len(chunks):
+        if p not in page_texts:
             continue
         abs_page = (abs_offset + p) if abs_offset is not None else p
-        page = chunks[p - 1]
-        for ln, line in enumerate(page.splitlines(), start=1):
+        page = page_texts[p]
+        lines = page.splitlines(keepends=True)
+        line_starts = [0] * len(lines)
+        for i in range(1, len(lines)):
+            line_starts[i] = line_starts[i - 1] + len(lines[i - 1])
+        n_dot_lines = flagged_lines(page, line_starts, N_DOT_RE)
+        umlaut_lines = flagged_lines(page, line_starts, UMLAUT_RE)
+        tibetan_lines = flagged_lines(page, line_starts, TIBETAN_RE)
+        garbage_char_lines = flagged_lines(page, line_starts, garbage_chars()[2])
+        for ln, line in enumerate(lines, start=1):
             s = line.strip()
             if not s:
                 continue
-            if N_DOT_RE.search(s):
+            if ln in n_dot_lines:
                 n_dot_rows.append([volume_label, str(p), str(abs_page), str(ln), s, "n_dot_focus"])
-            lc = s.lower()
-            if UMLAUT_RE.search(s) and (
-                SANSKRIT_CUE_RE.search(lc)
-                or SANSKRIT_DIAC_RE.search(s)
-                or SANSKRIT_TOKEN_CUE_RE.search(lc)
-            ):
-                sanskrit_rows.append(
-                    [volume_label, str(p), str(abs_page), str(ln), s, "sanskrit_umlaut_candidate"]
-                )
+            if ln in umlaut_lines:
+                lc = s.lower()
+                if SANSKRIT_CUE_RE.search(lc) or SANSKRIT_DIAC_RE.search(s) or SANSKRIT_TOKEN_CUE_RE.search(lc):
+                    sanskrit_rows.append(
+                        [volume_label, str(p), str(abs_page), str(ln), s, "sanskrit_umlaut_candidate"]
+                    )
+            if ln not in garbage_char_lines:
+                continue
             s_clean = strip_citation_like_spans(s)
-            has_tibetan = bool(TIBETAN_RE.search(s))
+            has_tibetan = ln in tibetan_lines
             has_romanish = bool(ROMANIZATION_CUE_RE.search(s_clean))
-            looks_citation = bool(CITATION_LINE_RE.search(s)) and not has_tibetan
-            context_ok = (has_tibetan or has_romanish) and not looks_citation
+            # Lines outside Tibetan/romanization context can never yield a garbage row, so skip
+            # the citation, digit-pattern and token scans for them; Tibetan lines are never
+            # treated as citations, so they skip CITATION_LINE_RE too.
+            if not (has_tibetan or has_romanish):
+                continue
+            if not has_tibetan and CITATION_LINE_RE.search(s):
+                continue
 
+            # One tokenization serves both checks: the first symbol-heavy token is only needed
+            # while no high-risk token has been seen.
             high_risk = False
+            symbol_tok = None
             for tok in TOKEN_RE.findall(s_clean):
-                if GARBAGE_TOKEN_RE.match(tok):
+                if is_garbage_token(tok):
                     high_risk = True
                     break
-            if (DIGIT_GARBAGE_RE.search(s_clean) or high_risk) and context_ok:
+                if symbol_tok is None and len(tok) >= 4 and token_garbage_ratio(tok) >= 0.5:
+                    symbol_tok = tok
+            if DIGIT_GARBAGE_RE.search(s_clean) or high_risk:
                 garbage_rows.append(
                     [volume_label, str(p), str(abs_page), str(ln), s, "digit_pattern_romanization_context"]
                 )
@@ -145,41 +249,56 @@ def collect_candidates(
                     garbage_high_rows.append(
                         [volume_label, str(p), str(abs_page), str(ln), s, "digit_pattern_high_risk_romanization"]
                     )
-                continue
-            for tok in TOKEN_RE.findall(s_clean):
-                if len(tok) >= 4 and token_garbage_ratio(tok) >= 0.5:
-                    if not context_ok:
-                        break
-                    garbage_rows.append(
-                        [
-                            volume_label,
-                            str(p),
-                            str(abs_page),
-                            str(ln),
-                            s,
-                            f"symbol_ratio_romanization_context:{tok}",
-                        ]
-                    )
-                    if high_risk and has_romanish:
-                        garbage_high_rows.append(
-                            [
-                                volume_label,
-                                str(p),
-                                str(abs_page),
-                                str(ln),
-                                s,
-                                f"symbol_ratio_high_risk_romanization:{tok}",
-                            ]
-                        )
-                    break
+            elif symbol_tok is not None:
+                garbage_rows.append(
+                    [
+                        volume_label,
+                        str(p),
+                        str(abs_page),
+                        str(ln),
+                        s,
+                        f"symbol_ratio_romanization_context:{symbol_tok}",
+                    ]
+                )
     return n_dot_rows, sanskrit_rows, garbage_rows, garbage_high_rows
 
 
-def write_tsv(path: Path, rows: list[list[str]]) -> None:
-    with path.open("w", encoding="utf-8", newline="") as f:
-        w = csv.writer(f, delimiter="\t")
-        w.writerow(["volume", "page_rel", "page_abs", "line_no", "line_text", "reason"])
-        w.writerows(rows)
+CANDIDATE_HEADER = ["volume", "page_rel", "page_abs", "line_no", "line_text", "reason"]
+
+
+def open_tsv(stack: ExitStack, path: Path, header: list[str]) -> Callable[[Iterable[Sequence[str]]], None]:
+    """Open ``path`` for streamed TSV rows under ``stack`` and write its header."""
+    f = stack.enter_context(path.open("w", encoding="utf-8", newline="", buffering=1 << 20))
+    write_rows = csv.writer(f, delimiter="\t").writerows
+    write_rows([header])
+    return write_rows
+
+
+def link_or_copy(src: Path, dst: Path) -> None:
+    """Hard-link ``dst`` to ``src``, copying instead where the filesystem has no hard links."""
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def process_volume(
+    label: str, path: Path, outdir: Path
+) -> tuple[list[list[str]], list[list[str]], list[list[str]], list[list[str]], list[list[str]]]:
+    """Sample one volume, write its selected-pages text, and return its meta and candidate rows."""
+    pages, page_texts = read_sampled_pages(path, SAMPLE_PER_VOLUME)
+    abs_offset = parse_abs_offset(path.name)
+    meta_rows: list[list[str]] = []
+    for pr in pages:
+        abs_page = (abs_offset + pr) if abs_offset is not None else pr
+        meta_rows.append([label, str(pr), str(abs_page), path.name])
+
+    write_selected_pages(page_texts, pages, outdir / f"{label}_selected_20pages.txt", label, abs_offset)
+    n_dot_rows, sanskrit_rows, garbage_rows, garbage_high_rows = collect_candidates(
+        page_texts, pages, label, abs_offset
+    )
+    return meta_rows, n_dot_rows, sanskrit_rows, garbage_rows, garbage_high_rows
 
 
 def main() -> int:
@@ -192,50 +311,41 @@ def main() -> int:
     outdir = Path(args.outdir)
     outdir.mkdir(parents=True, exist_ok=True)
 
-    all_meta_rows: list[list[str]] = []
-    all_n_dot: list[list[str]] = []
-    all_sanskrit: list[list[str]] = []
-    all_garbage: list[list[str]] = []
-    all_garbage_high: list[list[str]] = []
-
-    inputs = [("v1", Path(args.vol1)), ("v2", Path(args.vol2))]
-    for label, p in inputs:
-        text = p.read_text(encoding="utf-8", errors="replace")
-        total_pages = text.count("\f") + 1
-        pages = stratified_pages(total_pages, SAMPLE_PER_VOLUME)
-        abs_offset = parse_abs_offset(p.name)
-        for pr in pages:
-            abs_page = (abs_offset + pr) if abs_offset is not None else pr
-            all_meta_rows.append([label, str(pr), str(abs_page), p.name])
-
-        write_selected_pages(
-            text, pages, outdir / f"{label}_selected_20pages.txt", label, abs_offset
-        )
-        n_dot_rows, sanskrit_rows, garbage_rows, garbage_high_rows = collect_candidates(
-            text, pages, label, abs_offset
-        )
-        all_n_dot.extend(n_dot_rows)
-        all_sanskrit.extend(sanskrit_rows)
-        all_garbage.extend(garbage_rows)
-        all_garbage_high.extend(garbage_high_rows)
-
-    with (outdir / "selected_pages.tsv").open("w", encoding="utf-8", newline="") as f:
-        w = csv.writer(f, delimiter="\t")
-        w.writerow(["volume", "page_rel", "page_abs", "source_file"])
-        w.writerows(all_meta_rows)
-
-    write_tsv(outdir / "n_dot_candidates.tsv", all_n_dot)
-    write_tsv(outdir / "sanskrit_umlaut_candidates.tsv", all_sanskrit)
-    write_tsv(outdir / "digit_symbol_garbage_candidates.tsv", all_garbage)
-    write_tsv(outdir / "digit_symbol_garbage_highrisk.tsv", all_garbage_high)
-    write_tsv(outdir / "digit_symbol_romanization_highrisk.tsv", all_garbage_high)
+    labels = ["v1", "v2"]
+    paths = [Path(args.vol1), Path(args.vol2)]
+    n_meta = n_n_dot = n_sanskrit = n_garbage = n_garbage_high = 0
+    with ExitStack() as stack:
+        write_meta = open_tsv(stack, outdir / "selected_pages.tsv", ["volume", "page_rel", "page_abs", "source_file"])
+        write_n_dot = open_tsv(stack, outdir / "n_dot_candidates.tsv", CANDIDATE_HEADER)
+        write_sanskrit = open_tsv(stack, outdir / "sanskrit_umlaut_candidates.tsv", CANDIDATE_HEADER)
+        write_garbage = open_tsv(stack, outdir / "digit_symbol_garbage_candidates.tsv", CANDIDATE_HEADER)
+        write_garbage_high = open_tsv(stack, outdir / "digit_symbol_garbage_highrisk.tsv", CANDIDATE_HEADER)
+        # Volumes are independent until the combined TSVs are written; rows are streamed out
+        # as each volume's result arrives (in input order) rather than collected first.
+        with ProcessPoolExecutor(max_workers=len(paths)) as ex:
+            for meta_rows, n_dot_rows, sanskrit_rows, garbage_rows, garbage_high_rows in ex.map(
+                process_volume, labels, paths, repeat(outdir)
+            ):
+                write_meta(meta_rows)
+                write_n_dot(n_dot_rows)
+                write_sanskrit(sanskrit_rows)
+                write_garbage(garbage_rows)
+                write_garbage_high(garbage_high_rows)
+                n_meta += len(meta_rows)
+                n_n_dot += len(n_dot_rows)
+                n_sanskrit += len(sanskrit_rows)
+                n_garbage += len(garbage_rows)
+                n_garbage_high += len(garbage_high_rows)
+
+    # Legacy name for the same rows: link rather than serialize them a second time.
+    link_or_copy(outdir / "digit_symbol_garbage_highrisk.tsv", outdir / "digit_symbol_romanization_highrisk.tsv")
 
     print(f"outdir={outdir}")
-    print(f"selected_pages={len(all_meta_rows)}")
-    print(f"n_dot_candidates={len(all_n_dot)}")
-    print(f"sanskrit_umlaut_candidates={len(all_sanskrit)}")
-    print(f"digit_symbol_candidates={len(all_garbage)}")
-    print(f"digit_symbol_highrisk={len(all_garbage_high)}")
+    print(f"selected_pages={n_meta}")
+    print(f"n_dot_candidates={n_n_dot}")
+    print(f"sanskrit_umlaut_candidates={n_sanskrit}")
+    print(f"digit_symbol_candidates={n_garbage}")
+    print(f"digit_symbol_highrisk={n_garbage_high}")
     return 0
 
 
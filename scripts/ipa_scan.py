@@ -1,32 +1,64 @@
 #!/usr/bin/env python3
 import argparse
+import mmap
 import re
 import sys
+from bisect import bisect_right
 
 
 IPA_PATTERN = re.compile(r"[\u0250-\u02AF\u1D00-\u1D7F\u1D80-\u1DBF\u2C60-\u2C7F]")
+# IPA_PATTERN over raw UTF-8, so the file can be scanned from a memory map without decoding:
+# U+0250-02AF, U+1D00-1DBF and U+2C60-2C7F. Lead bytes never occur as continuation bytes,
+# so a hit is always aligned to a character.
+IPA_BYTES_RE = re.compile(
+    rb"\xc9[\x90-\xbf]|\xca[\x80-\xaf]|\xe1[\xb4-\xb6][\x80-\xbf]|\xe2\xb1[\xa0-\xbf]"
+)
+# Line boundaries as str.splitlines() sees them after universal-newline decoding.
+LINE_BREAK_BYTES_RE = re.compile(rb"\r\n|[\n\r\v\f\x1c\x1d\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
 
 
 def scan_file(path: str, max_lines: int) -> int:
     try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            text = f.read()
+        with open(path, "rb") as f:
+            if f.seek(0, 2) == 0:
+                data: bytes | mmap.mmap = b""
+            else:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
     except OSError as e:
         print(f"[ipa_scan] ERROR: cannot read {path}: {e}", file=sys.stderr)
         return 1
 
-    matches = IPA_PATTERN.findall(text)
-    line_hits = []
-    for i, line in enumerate(text.splitlines(), start=1):
-        if IPA_PATTERN.search(line):
-            line_hits.append((i, line))
+    try:
+        break_starts: list[int] = []
+        break_ends: list[int] = []
+        for m in LINE_BREAK_BYTES_RE.finditer(data):
+            break_starts.append(m.start())
+            break_ends.append(m.end())
+        n_chars = 0
+        n_lines = 0
+        last_line = -1
+        line_hits = []
+        for m in IPA_BYTES_RE.finditer(data):
+            n_chars += 1
+            i = bisect_right(break_starts, m.start())
+            if i == last_line:
+                continue
+            last_line = i
+            n_lines += 1
+            if len(line_hits) < max_lines:
+                start = break_ends[i - 1] if i > 0 else 0
+                end = break_starts[i] if i < len(break_starts) else len(data)
+                line_hits.append((i + 1, data[start:end].decode("utf-8", errors="ignore")))
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
 
     print(f"[ipa_scan] {path}")
-    print(f"  IPA chars: {len(matches)}")
-    print(f"  IPA lines: {len(line_hits)}")
-    if line_hits:
+    print(f"  IPA chars: {n_chars}")
+    print(f"  IPA lines: {n_lines}")
+    if n_lines:
         print("  Sample lines:")
-        for i, line in line_hits[:max_lines]:
+        for i, line in line_hits:
             print(f"    L{i}: {line}")
     return 0
 
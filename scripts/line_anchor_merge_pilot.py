@@ -16,16 +16,29 @@ Outputs:
 from __future__ import annotations
 
 import argparse
+import codecs
 import csv
 import difflib
+import hashlib
+import os
 import re
+import string
 import subprocess
 import sys
 import unicodedata
+from bisect import bisect_right
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, nullcontext
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from itertools import chain
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable, Iterator
 from xml.etree import ElementTree as ET
 
+if TYPE_CHECKING:
+    from PIL import Image
+
 TIB_RE = re.compile(r"[\u0F00-\u0FFF]")
 DEV_RE = re.compile(r"[\u0900-\u097F]")
 LATIN_RE = re.compile(r"[A-Za-z]")
@@ -36,25 +49,36 @@ TRANSLIT_HINT_RE = re.compile(
     r"\b(?:skt|skr)\.?|[āīūṛṝḷḹṅñṭḍṇśṣḥṃṁź]|(?:kh|tsh|ts|ch|ph|th|dh|bh|rdz|dz)|[a-z]'[a-z]",
     re.IGNORECASE,
 )
-BBOX_RE = re.compile(r"\bbbox (\d+) (\d+) (\d+) (\d+)\b")
-WS_RE = re.compile(r"\s+")
+# Same pieces as re.split(r"(\s+)", s) minus the empty strings, but lazily.
+WS_OR_TOKEN_RE = re.compile(r"\s+|\S+")
+# C0 controls other than tab/LF/CR are illegal in XML. In UTF-8 these bytes never occur
+# inside a multi-byte sequence, so they can be deleted before decoding.
+XML_ILLEGAL_BYTES = bytes(c for c in range(0x20) if c not in (0x09, 0x0A, 0x0D))
+HOCR_SPAN_TAG = "{http://www.w3.org/1999/xhtml}span"
 OCR_CONFUSABLE_I_RE = re.compile(r"\bI(?=[A-Za-zāīūṛṝḷḹṅñṭḍṇśṣḥṃṁź])")
 OCR_SUSPECT_RE = re.compile(r"[$]|\bI(?=[A-Za-zāīūṛṝḷḹṅñṭḍṇśṣḥṃṁź])")
 PA_APOSTROPHE_RE = re.compile(r"(?<![A-Za-zāīūṛṝḷḹṅñṭḍṇśṣḥṃṁź])pa[’'](?![A-Za-zāīūṛṝḷḹṅñṭḍṇśṣḥṃṁź])")
 ROMAN_TAIL_SUSPECT_RE = re.compile(r"[\u0F20-\u0F33£¥¢§¤@#%^&*_=/\\|~]")
-TOKEN_TRANSLIT_RE = re.compile(r"^[a-zA-Z'’āīūṛṝḷḹṅñṭḍṇśṣḥṃṁźäÄüÜşŞņŅãÃ]+$")
+ROMAN_TAIL_NOISE_RE = re.compile(r"[0-9:/%$£¥¢§¤@#^&*_=/\\|~]")
+ROMAN_TAIL_LETTER_CHARS = frozenset(string.ascii_letters + "āīūṛṝḷḹṅñṭḍṇśṣḥṃṁź")
+TIB_NON_DIGIT_RE = re.compile(r"[\u0F00-\u0F1F\u0F2A-\u0FFF]")
+TIB_DIGIT_START_RE = re.compile(r"^\s*[\u0F20-\u0F29]")
+TIB_OR_ASCII_DIGIT_START_RE = re.compile(r"^\s*[\u0F20-\u0F290-9]")
+CLEANUP_SCOPE_CUE_RE = re.compile(r"\b(?:Lex\.|skt\.?|skr\.?)\b", re.IGNORECASE)
+LOC_I_CONFUSION_RE = re.compile(r"\bI(?:ta|tar|ha|dan)\b")
+# Whole-token membership checks; frozenset.issuperset beats an anchored regex class here.
+TOKEN_TRANSLIT_CHARS = frozenset(string.ascii_letters + "'’āīūṛṝḷḹṅñṭḍṇśṣḥṃṁźäÄüÜşŞņŅãÃ")
 TOKEN_DIACRITIC_OR_SKT_RE = re.compile(r"[āīūṛṝḷḹṅñṭḍṇśṣḥṃṁź]")
-TOKEN_ANY_LATIN_RE = re.compile(r"^[A-Za-z'’āīūṛṝḷḹṅñṭḍṇśṣḥṃṁźäÄöÖüÜışŞņŅãÃ-]+$")
+TOKEN_ANY_LATIN_CHARS = frozenset(string.ascii_letters + "'’āīūṛṝḷḹṅñṭḍṇśṣḥṃṁźäÄöÖüÜışŞņŅãÃ-")
 SKT_CONTEXT_RE = re.compile(r"\b(?:skt|skr|sanskrit)(?:\.)?(?=\s|$|[:;,\)\]\}])", re.IGNORECASE)
 EQUALS_TRANSLIT_HINT_RE = re.compile(r"=\s*[A-Za-z'’äÄāīūṛṝḷḹṅñṭḍṇśṣḥṃṁź]{2,}")
-HEADWORD_SPLIT_RE = re.compile(r"^\s*(?P<prefix>[\u0F00-\u0FFF\s\u0F0B\u0F0C\u0F0D\u0F0E\u0F0F\u0F11-\u0F14\u0F20-\u0F29]+)(?P<tail>.*)$")
+# The prefix must open with a Tibetan character, so a match already implies Tibetan script.
+HEADWORD_SPLIT_RE = re.compile(r"^\s*(?P<prefix>[\u0F00-\u0FFF][\u0F00-\u0FFF\s]*)(?P<tail>.*)$")
+TIB_RUN_RE = re.compile(r"[\u0F00-\u0FFF][\u0F00-\u0FFF\s]*")
 TRANSLIT_CLUSTER_RE = re.compile(r"(?:kh|tsh|ts|ch|ph|th|dh|bh|rdz|dz|'" r"|’)", re.IGNORECASE)
-N_TILDE_BEFORE_IE_RE = re.compile(r"ñ(?=[iIeEīĪ])")
-N_TILDE_BEFORE_S_FINAL_RE = re.compile(r"ñ(?=[sS](?:\s|$|[,\.;:!\?\)\]\}\"“”„'’/\-་།]))")
-N_TILDE_ACUTE_N_BEFORE_S_FINAL_RE = re.compile(r"ñń(?=[sS](?:\s|$|[,\.;:!\?\)\]\}\"“”„'’/\-་།]))")
-N_TILDE_SYL_FINAL_RE = re.compile(r"ñ(?=(?:\s|$|[,\.;:!\?\)\]\}\"“”„'’/\-་།]))")
-N_ACUTE_N_BEFORE_S_FINAL_RE = re.compile(r"ń(?=[sS](?:\s|$|[,\.;:!\?\)\]\}\"“”„'’/\-་།]))")
-N_ACUTE_N_SYL_FINAL_RE = re.compile(r"ń(?=(?:\s|$|[,\.;:!\?\)\]\}\"“”„'’/\-་།]))")
+# Syllable-final ñ/ń (optionally before a final -s) and ñń before final -s collapse to ṅ.
+# ñ before i/e never reaches a final boundary, so the palatal case is left untouched.
+N_SYL_FINAL_RE = re.compile(r"ñń(?=[sS](?:\s|$|[,\.;:!\?\)\]\}\"“”„'’/\-་།]))|[ñń](?=[sS]?(?:\s|$|[,\.;:!\?\)\]\}\"“”„'’/\-་།]))")
 N_TILDE_GRAVE_PAIR_RE = re.compile(r"ñù", re.IGNORECASE)
 ROMAN_NOISE_TOKEN_RE = re.compile(r"^[0-9:/%.,;+\-]{2,}$")
 ROMAN_NOISE_DIGSYM_RE = re.compile(r"^(?=.*\d)(?=.*[^A-Za-zāīūṛṝḷḹṅñṭḍṇśṣḥṃṁźäÄöÖüÜı0-9])[^\s]+$")
@@ -115,6 +139,8 @@ POST_FIX_WORDS = (
     ("Idan", "ldan"),
     ("gyl", "gyi"),
 )
+POST_FIX_MAP = dict(POST_FIX_WORDS)
+POST_FIX_RE = re.compile(r"\b(?:" + "|".join(re.escape(bad) for bad, _ in POST_FIX_WORDS) + r")\b")
 SANSKRIT_HINT_SUBSTRINGS = (
     "sutra",
     "tantra",
@@ -132,11 +158,15 @@ SANSKRIT_HINT_SUBSTRINGS = (
     "yoga",
     "mantra",
 )
+SANSKRIT_HINT_CLUSTERS = ("bh", "dh", "gh", "kh", "ph", "th", "sh", "tsh", "dz", "rdz")
+# Hint words and aspirate clusters both mark a base as Sanskritic, so one scan covers both.
+SANSKRIT_HINT_RE = re.compile("|".join(map(re.escape, SANSKRIT_HINT_SUBSTRINGS + SANSKRIT_HINT_CLUSTERS)))
 WORD_RE = re.compile(r"[A-Za-zāīūṛṝḷḹṅñṭḍṇśṣḥṃṁźäÄöÖüÜışŞņŅãÃ]+(?:-[A-Za-zāīūṛṝḷḹṅñṭḍṇśṣḥṃṁźäÄöÖüÜışŞņŅãÃ]+)*")
 DIGIT_RUN_RE = re.compile(r"\d{3,}")
 REPEATED_DIGIT_RE = re.compile(r"(\d)\1{2,}")
 ALNUM_MIXED_RE = re.compile(r"(?=.*[A-Za-zāīūṛṝḷḹṅñṭḍṇśṣḥṃṁźäÄöÖüÜı])(?=.*\d)[A-Za-z0-9āīūṛṝḷḹṅñṭḍṇśṣḥṃṁźäÄöÖüÜı]+")
 SUSPECT_SYMBOL_RE = re.compile(r"[£¥¢§¤]")
+ANOMALY_HINT_RE = re.compile(r"[\d£¥¢§¤ùÙ]")
 TIB_SYLLABLE_SPLIT_RE = re.compile(r"[\s\u0F0B\u0F0C\u0F0D\u0F0E\u0F0F\u0F11-\u0F14\u0F20-\u0F29]+")
 DEHYPH_LINE_END_RE = re.compile(r"([A-Za-z][A-Za-zäöüÄÖÜāīūṛṝḷḹṅñṭḍṇśṣḥṃṁź]*)-$")
 BIBLIO_MARKER_RE = re.compile(
@@ -144,12 +174,14 @@ BIBLIO_MARKER_RE = re.compile(
     re.IGNORECASE,
 )
 YEAR_RE = re.compile(r"\b(?:1[89]\d{2}|20\d{2})\b")
-TRANSLIT_CHAR_RE = re.compile(r"[A-Za-zāīūṛṝḷḹṅñṭḍṇśṣḥṃṁźäÄöÖüÜßẞıışŞņŅãÃ]")
+# Letters are dense in these strings, so counting by set membership beats len(findall()).
+TRANSLIT_CHARS = frozenset(string.ascii_letters + "āīūṛṝḷḹṅñṭḍṇśṣḥṃṁźäÄöÖüÜßẞışŞņŅãÃ")
 # OCR occasionally emits unsupported Latin letters/accents (e.g. thorn, grave vowels)
 # that are outside project transliteration/German target alphabets.
 UNSUPPORTED_LATIN_OCR_CHAR_RE = re.compile(r"[þÞðÐàÀèÈìÌòÒùÙ]")
-QUOTE_NORMALIZE_MAP = str.maketrans(
+TEXT_NORMALIZE_MAP = str.maketrans(
     {
+        "\u0131": "i",
         "“": '"',
         "”": '"',
         "„": '"',
@@ -164,17 +196,18 @@ QUOTE_NORMALIZE_MAP = str.maketrans(
 
 
 def normalize_text(s: str) -> str:
-    s = unicodedata.normalize("NFC", s)
-    s = s.translate(QUOTE_NORMALIZE_MAP)
-    s = s.replace("\u0131", "i")
-    s = s.replace("\f", " ")
-    return WS_RE.sub(" ", s.replace("\n", " ")).strip()
+    s = unicodedata.normalize("NFC", s).translate(TEXT_NORMALIZE_MAP)
+    # str.split() uses the same whitespace set as \s, so this also folds \f and \n.
+    return " ".join(s.split())
 
 
-def is_bibliography_line(s: str) -> bool:
+def is_bibliography_line(s: str, has_latin: bool | None = None) -> bool:
+    # Callers that already scanned for Latin pass the result to skip a second search.
     if not s:
         return False
-    if not LATIN_RE.search(s):
+    if has_latin is None:
+        has_latin = bool(LATIN_RE.search(s))
+    if not has_latin:
         return False
     marker_hits = len(BIBLIO_MARKER_RE.findall(s))
     year_hits = len(YEAR_RE.findall(s))
@@ -193,7 +226,7 @@ def line_zones(s: str) -> set[str]:
     has_latin = bool(LATIN_RE.search(s))
     if has_tib:
         zones.add("tibetan")
-    if is_bibliography_line(s):
+    if is_bibliography_line(s, has_latin):
         zones.add("bibliography")
     if has_tib and translit_tail_after_tibetan(s):
         zones.add("romanization")
@@ -207,7 +240,12 @@ def line_zones(s: str) -> set[str]:
     return zones
 
 
-def classify_block_context(lines: list[str], idx: int, window: int = 2) -> dict[str, bool]:
+def page_line_zones(lines: list[str]) -> list[set[str]]:
+    # Computed once per page; classify_block_context slides a window over the result.
+    return [line_zones(normalize_text(line)) for line in lines]
+
+
+def classify_block_context(zones_per_line: list[set[str]], idx: int, window: int = 2) -> dict[str, bool]:
     counts = {
         "tibetan": 0,
         "romanization": 0,
@@ -216,9 +254,9 @@ def classify_block_context(lines: list[str], idx: int, window: int = 2) -> dict[
         "german_prose": 0,
     }
     start = max(0, idx - window)
-    end = min(len(lines), idx + window + 1)
-    for i in range(start, end):
-        for z in line_zones(normalize_text(lines[i])):
+    end = min(len(zones_per_line), idx + window + 1)
+    for zones in zones_per_line[start:end]:
+        for z in zones:
             if z in counts:
                 counts[z] += 1
     span = max(1, end - start)
@@ -276,10 +314,10 @@ def sanskrit_marker_ranges(s: str) -> list[tuple[int, int]]:
 
 
 def in_ranges(pos: int, ranges: list[tuple[int, int]]) -> bool:
-    for st, en in ranges:
-        if st <= pos < en:
-            return True
-    return False
+    # Ranges are sorted and disjoint (see sanskrit_marker_ranges), so only the last range
+    # starting at or before pos can contain it. (pos, inf) sorts after every (pos, end).
+    i = bisect_right(ranges, (pos, float("inf"))) - 1
+    return i >= 0 and pos < ranges[i][1]
 
 
 def normalize_romanization_segment(s: str, sanskrit_context: bool) -> str:
@@ -287,17 +325,8 @@ def normalize_romanization_segment(s: str, sanskrit_context: bool) -> str:
     out = out.replace("$", "ś")
     out = PA_APOSTROPHE_RE.sub("pa'i", out)
     out = N_TILDE_GRAVE_PAIR_RE.sub("ṅ", out)
-    for bad, good in POST_FIX_WORDS:
-        out = re.sub(rf"\b{re.escape(bad)}\b", good, out)
-
-    protected = "\uE000"
-    out = N_TILDE_BEFORE_IE_RE.sub(protected, out)
-    out = N_TILDE_ACUTE_N_BEFORE_S_FINAL_RE.sub("ṅ", out)
-    out = N_TILDE_BEFORE_S_FINAL_RE.sub("ṅ", out)
-    out = N_TILDE_SYL_FINAL_RE.sub("ṅ", out)
-    out = N_ACUTE_N_BEFORE_S_FINAL_RE.sub("ṅ", out)
-    out = N_ACUTE_N_SYL_FINAL_RE.sub("ṅ", out)
-    out = out.replace(protected, "ñ")
+    out = POST_FIX_RE.sub(lambda m: POST_FIX_MAP[m.group(0)], out)
+    out = N_SYL_FINAL_RE.sub("ṅ", out)
 
     # Sanskrit-style repairs only for transliteration-looking tokens.
     parts: list[str] = []
@@ -368,12 +397,10 @@ def split_line_spans(s: str) -> list[tuple[str, str]]:
     return spans
 
 
-def post_cleanup_contextual(lines: list[str], idx: int, s: str) -> str:
+def post_cleanup_contextual(zones_per_line: list[set[str]], idx: int, s: str) -> str:
     out = normalize_text(s)
-    ctx = classify_block_context(lines, idx)
-    has_explicit_confusable = ("$" in out) or PA_APOSTROPHE_RE.search(out) or any(
-        re.search(rf"\b{re.escape(bad)}\b", out) for bad, _ in POST_FIX_WORDS
-    )
+    ctx = classify_block_context(zones_per_line, idx)
+    has_explicit_confusable = ("$" in out) or PA_APOSTROPHE_RE.search(out) or POST_FIX_RE.search(out)
     if not (LATIN_RE.search(out) or has_explicit_confusable):
         return out
 
@@ -406,6 +433,8 @@ def normalize_ocr_confusables(s: str) -> str:
     return s
 
 
+# should_replace and the splice check ask for the same line's merge keys several times.
+@lru_cache(maxsize=4096)
 def base_equivalent_for_merge(s: str) -> str:
     # Compare lines with diacritics and punctuation stripped to detect near-identical OCR variants.
     out = normalize_ocr_confusables(s).translate(DIACRITIC_BASE_TABLE)
@@ -413,6 +442,7 @@ def base_equivalent_for_merge(s: str) -> str:
     return normalize_text(out).casefold()
 
 
+@lru_cache(maxsize=4096)
 def tibetan_anchor_for_merge(s: str) -> str:
     chunks = TIB_RE.findall(s)
     if not chunks:
@@ -421,7 +451,7 @@ def tibetan_anchor_for_merge(s: str) -> str:
 
 
 def translit_tail_after_tibetan(s: str) -> str:
-    m = re.search(r"[\u0F00-\u0FFF][\u0F00-\u0FFF\s\u0F0B\u0F0C\u0F0D\u0F0E\u0F0F\u0F11-\u0F14\u0F20-\u0F29]*", s)
+    m = TIB_RUN_RE.search(s)
     if not m:
         return ""
     tail = normalize_text(s[m.end() :])
@@ -432,18 +462,14 @@ def split_tibetan_prefix_tail(s: str) -> tuple[str, str]:
     m = HEADWORD_SPLIT_RE.match(s)
     if not m:
         return "", ""
-    prefix = m.group("prefix")
-    tail = normalize_text(m.group("tail"))
-    if not TIB_RE.search(prefix):
-        return "", ""
-    return prefix, tail
+    return m.group("prefix"), normalize_text(m.group("tail"))
 
 
 def roman_tail_quality_score(s: str) -> tuple[int, int, int]:
     tail = translit_tail_after_tibetan(s)
     if not tail:
         return (0, 0, 0)
-    letters = len(re.findall(r"[A-Za-zāīūṛṝḷḹṅñṭḍṇśṣḥṃṁź]", tail))
+    letters = sum(map(ROMAN_TAIL_LETTER_CHARS.__contains__, tail))
     suspects = len(ROMAN_TAIL_SUSPECT_RE.findall(tail))
     diacritics = len(DIACRITIC_RE.findall(tail))
     return (letters, -suspects, diacritics)
@@ -454,14 +480,22 @@ def roman_tail_noise_score(s: str) -> int:
     if not tail:
         return 0
     # Conservative: count obvious OCR junk in romanization tails only.
-    return len(re.findall(r"[0-9:/%$£¥¢§¤@#^&*_=/\\|~]", tail))
+    return len(ROMAN_TAIL_NOISE_RE.findall(tail))
+
+
+def is_translit_token(token: str) -> bool:
+    return bool(token) and TOKEN_TRANSLIT_CHARS.issuperset(token)
+
+
+def is_any_latin_token(token: str) -> bool:
+    return bool(token) and TOKEN_ANY_LATIN_CHARS.issuperset(token)
 
 
 def normalize_translit_token_dieresis(token: str, sanskrit_context: bool) -> str:
     # Conservative: transliteration-looking tokens in Sanskritic context.
     if not sanskrit_context:
         return token
-    if not TOKEN_ANY_LATIN_RE.match(token):
+    if not is_any_latin_token(token):
         return token
     if all(ch not in token for ch in ("ä", "Ä", "ü", "Ü")):
         return token
@@ -500,7 +534,7 @@ def token_to_ascii_base(token: str) -> str:
 def token_looks_sanskritic(token: str) -> bool:
     if not token:
         return False
-    if not TOKEN_ANY_LATIN_RE.match(token):
+    if not is_any_latin_token(token):
         return False
     if DIACRITIC_RE.search(token):
         return True
@@ -509,11 +543,7 @@ def token_looks_sanskritic(token: str) -> bool:
     base = token_to_ascii_base(token)
     if not base:
         return False
-    if any(h in base for h in SANSKRIT_HINT_SUBSTRINGS):
-        return True
-    if re.search(r"(bh|dh|gh|kh|ph|th|sh|tsh|dz|rdz)", base):
-        return True
-    return False
+    return bool(SANSKRIT_HINT_RE.search(base))
 
 
 def normalize_sanskrit_umlauts_in_text(s: str) -> str:
@@ -556,15 +586,13 @@ def token_has_translit_cues(token: str) -> bool:
 
 def translit_lead_tokens(tail: str) -> list[str]:
     # Leading token run after Tibetan headword that still looks like transliteration.
-    parts = re.split(r"(\s+)", tail)
     out: list[str] = []
-    for part in parts:
-        if not part:
-            continue
+    for m in WS_OR_TOKEN_RE.finditer(tail):
+        part = m.group(0)
         if part.isspace():
             out.append(part)
             continue
-        if TOKEN_TRANSLIT_RE.match(part):
+        if is_translit_token(part):
             out.append(part)
             continue
         break
@@ -574,11 +602,11 @@ def translit_lead_tokens(tail: str) -> list[str]:
 def is_roman_noise_token(tok: str) -> bool:
     if not tok:
         return False
-    if TOKEN_TRANSLIT_RE.match(tok):
+    if is_translit_token(tok):
         return False
     char_count = len(tok)
     if char_count:
-        letter_count = len(TRANSLIT_CHAR_RE.findall(tok))
+        letter_count = translit_letter_count(tok)
         non_letter_ratio = (char_count - letter_count) / char_count
         if char_count >= 3 and non_letter_ratio > 0.40:
             return True
@@ -599,21 +627,18 @@ def drop_roman_tail_noise_after_tibetan(line: str) -> str:
     prefix, tail = split_tibetan_prefix_tail(line)
     if not prefix or not tail:
         return line
-    parts = re.split(r"(\s+)", tail)
     out_parts: list[str] = []
-    for idx, part in enumerate(parts):
-        if not part:
-            continue
+    for m in WS_OR_TOKEN_RE.finditer(tail):
+        part = m.group(0)
         if part.isspace():
             out_parts.append(part)
             continue
-        if TOKEN_TRANSLIT_RE.match(part):
+        if is_translit_token(part):
             out_parts.append(part)
             continue
         if is_roman_noise_token(part):
             continue
-        out_parts.append(part)
-        out_parts.extend(parts[idx + 1 :])
+        out_parts.append(tail[m.start() :])
         break
     if not out_parts:
         out_tail = tail
@@ -678,7 +703,7 @@ def normalize_dieresis_after_equals_translit(s: str) -> str:
         token = "".join(chars[j:k])
         converted = normalize_translit_token_dieresis(token, bool(token))
         converted = normalize_sanskrit_token_chars(converted, bool(token))
-        if converted != token and TOKEN_TRANSLIT_RE.match(token):
+        if converted != token and is_translit_token(token):
             chars[j:k] = list(converted)
         i = k
     return "".join(chars)
@@ -701,12 +726,10 @@ def enforce_ng_from_tibetan_prefix(line: str) -> str:
     lead_consumed = len("".join(lead))
     if lead_consumed <= 0:
         return line
-    lead_text = tail[:lead_consumed]
-    tokens = re.split(r"(\s+)", lead_text)
     roman_idx = 0
     out_parts: list[str] = []
-    for tok in tokens:
-        if not tok or tok.isspace():
+    for tok in lead:
+        if tok.isspace():
             out_parts.append(tok)
             continue
         fixed = tok
@@ -718,7 +741,9 @@ def enforce_ng_from_tibetan_prefix(line: str) -> str:
         roman_idx += 1
     fixed_lead = "".join(out_parts)
     fixed_tail = fixed_lead + tail[lead_consumed:]
-    return line[: len(line) - len(tail)] + fixed_tail
+    # tail is normalized (NFC, single spaces), so its length says nothing about where it
+    # starts in the raw line; rebuild from the prefix instead.
+    return line[: len(line) - len(line.lstrip()) + len(prefix)] + fixed_tail
 
 
 def dehyphenate_wrapped_lines(lines: list[str]) -> list[str]:
@@ -740,9 +765,10 @@ def dehyphenate_wrapped_lines(lines: list[str]) -> list[str]:
             out.append(cur)
             i += 1
             continue
-        m = DEHYPH_LINE_END_RE.search(cur.rstrip())
+        cur_stripped = cur.rstrip()
+        m = DEHYPH_LINE_END_RE.search(cur_stripped)
         if m and re.match(r"^[a-zäöü]", nxt.lstrip()):
-            merged = DEHYPH_LINE_END_RE.sub(r"\1", cur.rstrip()) + nxt.lstrip()
+            merged = cur_stripped[: m.end(1)] + nxt.lstrip()
             out.append(merged)
             i += 2
             continue
@@ -762,24 +788,23 @@ def line_is_translit_heavy(s: str) -> bool:
 
 
 def translit_noise_token_count(s: str) -> int:
-    return sum(1 for tok in re.findall(r"\S+", s) if is_roman_noise_token(tok))
+    return sum(1 for tok in s.split() if is_roman_noise_token(tok))
 
 
 def translit_letter_count(s: str) -> int:
-    return len(TRANSLIT_CHAR_RE.findall(s))
+    return sum(map(TRANSLIT_CHARS.__contains__, s))
 
 
 def translit_cleanup_scope(s: str) -> bool:
+    # line_is_translit_heavy already accepts any line containing Tibetan script.
     if line_is_translit_heavy(s):
         return True
-    if TIB_RE.search(s):
-        return True
     if "'" in s or "’" in s:
         return True
-    if re.search(r"\b(?:Lex\.|skt\.?|skr\.?)\b", s, re.IGNORECASE):
+    if CLEANUP_SCOPE_CUE_RE.search(s):
         return True
     # Known OCR confusion locus in LOC transliteration contexts.
-    if re.search(r"\bI(?:ta|tar|ha|dan)\b", s):
+    if LOC_I_CONFUSION_RE.search(s):
         return True
     return False
 
@@ -787,19 +812,25 @@ def translit_cleanup_scope(s: str) -> bool:
 def collect_anomalies(page: int, line_no: int, text: str) -> list[dict[str, object]]:
     rows: list[dict[str, object]] = []
     zones = ",".join(sorted(line_zones(text)))
-    for tok in WORD_RE.findall(text):
-        if any(ch in tok for ch in ("ä", "Ä", "ü", "Ü")) and token_looks_sanskritic(tok):
-            rows.append(
-                {
-                    "page": page,
-                    "line": line_no,
-                    "type": "sanskrit_umlaut_candidate",
-                    "token": tok,
-                    "context": text,
-                    "zones": zones,
-                }
-            )
-    for tok in re.findall(r"\S+", text):
+    if any(ch in text for ch in ("ä", "Ä", "ü", "Ü")):
+        for tok in WORD_RE.findall(text):
+            if any(ch in tok for ch in ("ä", "Ä", "ü", "Ü")) and token_looks_sanskritic(tok):
+                rows.append(
+                    {
+                        "page": page,
+                        "line": line_no,
+                        "type": "sanskrit_umlaut_candidate",
+                        "token": tok,
+                        "context": text,
+                        "zones": zones,
+                    }
+                )
+    if not ANOMALY_HINT_RE.search(text):
+        return rows
+    for tok in text.split():
+        # Every token check below needs a digit, a suspect symbol, or u-grave.
+        if not ANOMALY_HINT_RE.search(tok):
+            continue
         if DIGIT_RUN_RE.search(tok):
             rows.append({"page": page, "line": line_no, "type": "digit_run", "token": tok, "context": text, "zones": zones})
         if REPEATED_DIGIT_RE.search(tok):
@@ -813,6 +844,65 @@ def collect_anomalies(page: int, line_no: int, text: str) -> list[dict[str, obje
     return rows
 
 
+@dataclass(frozen=True)
+class TextFeatures:
+    norm: str
+    diacritics: int
+    has_tib: bool
+    has_dev: bool
+    tail_quality: tuple[int, int, int]
+
+
+@lru_cache(maxsize=8192)
+def text_features(s: str) -> TextFeatures:
+    # Shared by choose_best_b_text and should_replace, which look at the same candidate strings.
+    norm = normalize_text(s)
+    return TextFeatures(
+        norm=norm,
+        diacritics=len(DIACRITIC_RE.findall(norm)),
+        has_tib=bool(TIB_RE.search(norm)),
+        has_dev=bool(DEV_RE.search(norm)),
+        tail_quality=roman_tail_quality_score(norm),
+    )
+
+
+@lru_cache(maxsize=8192)
+def text_similarity(a: str, b: str) -> float:
+    # Crop variants often OCR to the same string, and the chosen candidate is scored
+    # again by should_replace; memoize the ratio per normalized pair.
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+def similarity_below(a: str, b: str, floor: float) -> bool:
+    # True when text_similarity(a, b) is provably below floor. The length bound is the
+    # same float real_quick_ratio() computes; quick_ratio() is the multiset bound.
+    if not a or not b:
+        return 0.0 < floor
+    if a == b:
+        return 1.0 < floor
+    if 2.0 * min(len(a), len(b)) / (len(a) + len(b)) < floor:
+        return True
+    return difflib.SequenceMatcher(None, a, b).quick_ratio() < floor
+
+
+def similarity_at_least(a: str, b: str, threshold: float) -> bool:
+    # real_quick_ratio()/quick_ratio() are linear upper bounds on ratio(); only pay for the
+    # matching-block search when the bounds cannot already rule the pair out.
+    if a == b:
+        # SequenceMatcher does not special-case identical inputs; their ratio() is 1.0.
+        return threshold <= 1.0
+    matcher = difflib.SequenceMatcher(None, a, b)
+    return (
+        matcher.real_quick_ratio() >= threshold
+        and matcher.quick_ratio() >= threshold
+        and matcher.ratio() >= threshold
+    )
+
+
 def maybe_splice_tibetan_prefix_with_b_tail(a_text: str, b_text: str, min_similarity_tibetan_anchor: float) -> str:
     # If B drops Tibetan script but has a cleaner romanization tail, keep Tibetan prefix from A.
     if not a_text or not b_text:
@@ -829,8 +919,9 @@ def maybe_splice_tibetan_prefix_with_b_tail(a_text: str, b_text: str, min_simila
         length_ratio = len(b_tail) / len(a_tail)
         if length_ratio < 0.55 or length_ratio > 1.8:
             return ""
-    sim = difflib.SequenceMatcher(None, base_equivalent_for_merge(a_tail), base_equivalent_for_merge(b_tail)).ratio()
-    if sim < min_similarity_tibetan_anchor:
+    if not similarity_at_least(
+        base_equivalent_for_merge(a_tail), base_equivalent_for_merge(b_tail), min_similarity_tibetan_anchor
+    ):
         return ""
     a_sus = len(ROMAN_TAIL_SUSPECT_RE.findall(a_tail))
     b_sus = len(ROMAN_TAIL_SUSPECT_RE.findall(b_tail))
@@ -846,9 +937,7 @@ def post_cleanup_translit_line(s: str) -> str:
     out = normalize_text(s)
     zones = line_zones(out)
     # Restrict to lines that likely need normalization.
-    has_explicit_confusable = ("$" in out) or PA_APOSTROPHE_RE.search(out) or any(
-        re.search(rf"\b{re.escape(bad)}\b", out) for bad, _ in POST_FIX_WORDS
-    )
+    has_explicit_confusable = ("$" in out) or PA_APOSTROPHE_RE.search(out) or POST_FIX_RE.search(out)
     if not (
         {"romanization", "sanskrit"} & zones
         or has_explicit_confusable
@@ -859,21 +948,13 @@ def post_cleanup_translit_line(s: str) -> str:
         out = out.replace("$", "ś")
         out = PA_APOSTROPHE_RE.sub("pa'i", out)
         out = N_TILDE_GRAVE_PAIR_RE.sub("ṅ", out)
-        for bad, good in POST_FIX_WORDS:
-            out = re.sub(rf"\b{re.escape(bad)}\b", good, out)
+        out = POST_FIX_RE.sub(lambda m: POST_FIX_MAP[m.group(0)], out)
         # Romanization filter:
         # - ñ before i/e is palatal and should stay ñ.
         # - ñ before final -s is usually OCR's stand-in for dotted n + suffix.
         # - syllable-final ñ is usually OCR's stand-in for dotted n; normalize to ṅ.
         # - OCR acute-n noise (ń) in final position is also normalized to ṅ.
-        protected = "\uE000"
-        out = N_TILDE_BEFORE_IE_RE.sub(protected, out)
-        out = N_TILDE_ACUTE_N_BEFORE_S_FINAL_RE.sub("ṅ", out)
-        out = N_TILDE_BEFORE_S_FINAL_RE.sub("ṅ", out)
-        out = N_TILDE_SYL_FINAL_RE.sub("ṅ", out)
-        out = N_ACUTE_N_BEFORE_S_FINAL_RE.sub("ṅ", out)
-        out = N_ACUTE_N_SYL_FINAL_RE.sub("ṅ", out)
-        out = out.replace(protected, "ñ")
+        out = N_SYL_FINAL_RE.sub("ṅ", out)
     if "sanskrit" in zones:
         out = normalize_dieresis_in_skt_spans(out)
         out = normalize_dieresis_after_equals_translit(out)
@@ -888,8 +969,8 @@ def post_cleanup_translit_line(s: str) -> str:
             if use_macron_norm:
                 pieces: list[str] = []
                 lead_consumed = len("".join(lead))
-                for part in re.split(r"(\s+)", tail[:lead_consumed]):
-                    if part and not part.isspace():
+                for part in lead:
+                    if not part.isspace():
                         fixed = normalize_translit_token_dieresis(part, True)
                         fixed = normalize_sanskrit_token_chars(fixed, True)
                         pieces.append(fixed)
@@ -902,7 +983,8 @@ def post_cleanup_translit_line(s: str) -> str:
 
 
 def parse_pages_arg(pages: str) -> list[int]:
-    out: set[int] = set()
+    # Merge sorted spans directly instead of materializing a set of every page number.
+    spans: list[tuple[int, int]] = []
     for part in pages.split(","):
         part = part.strip()
         if not part:
@@ -913,10 +995,17 @@ def parse_pages_arg(pages: str) -> list[int]:
             end = int(b)
             if end < start:
                 start, end = end, start
-            out.update(range(start, end + 1))
+            spans.append((start, end))
         else:
-            out.add(int(part))
-    return sorted(out)
+            page = int(part)
+            spans.append((page, page))
+    spans.sort()
+    out: list[int] = []
+    for start, end in spans:
+        if out:
+            start = max(start, out[-1] + 1)
+        out.extend(range(start, end + 1))
+    return out
 
 
 def evenly_spaced_pages(start: int, end: int, n: int) -> list[int]:
@@ -927,11 +1016,10 @@ def evenly_spaced_pages(start: int, end: int, n: int) -> list[int]:
     span = end - start
     if span <= 0:
         return [start]
-    picks = []
-    for i in range(n):
-        pos = start + round((span * i) / (n - 1))
-        picks.append(pos)
-    return sorted(set(picks))
+    if n - 1 >= span:
+        # Steps of at most one page (with round-half-even) land on every page in the range.
+        return list(range(start, end + 1))
+    return sorted({start + round((span * i) / (n - 1)) for i in range(n)})
 
 
 def get_pdf_pages(pdf: Path) -> int:
@@ -980,71 +1068,165 @@ def run_tesseract_stdout_txt(image: Path, lang: str, psm: int, dpi: int, timeout
     return proc.stdout.replace("\f", "").strip()
 
 
+# Smallest Pass B batch worth its own tesseract start-up; below this, fewer and
+# larger batches beat spreading the crops over every worker.
+MIN_B_BATCH_CROPS = 8
+# Pass B results are reused for byte-identical crops (repeated headers, headwords);
+# the oldest entries are dropped once the run-level cache grows past this.
+OCR_CACHE_MAX_ENTRIES = 50_000
+# Upper bound on pages rendered per pdftoppm run, so Pass A can start on a long
+# --all-pages range before the whole volume is rasterized.
+RENDER_BATCH_PAGES = 16
+
+
+def run_tesseract_batch_txt(
+    images: list[Path], lang: str, psm: int, dpi: int, timeout_sec: float, list_path: Path
+) -> list[str]:
+    """OCR several crops in one tesseract process so engine and language data load once.
+
+    Tesseract reads a non-image input as a list of image paths and separates the
+    per-image text with form feeds. If the batch fails or the page count does not
+    line up, fall back to one process per crop.
+    """
+    if len(images) == 1:
+        return [run_tesseract_stdout_txt(images[0], lang, psm, dpi, timeout_sec)]
+    list_path.write_text("".join(f"{image}\n" for image in images), encoding="utf-8")
+    cmd = [
+        "tesseract",
+        str(list_path),
+        "stdout",
+        "-l",
+        lang,
+        "--psm",
+        str(psm),
+        "--dpi",
+        str(dpi),
+        "-c",
+        "preserve_interword_spaces=1",
+    ]
+    try:
+        proc = subprocess.run(cmd, text=True, errors="replace", capture_output=True, timeout=timeout_sec * len(images))
+    except subprocess.TimeoutExpired:
+        proc = None
+    if proc is not None and proc.returncode == 0:
+        texts = proc.stdout.split("\f")
+        # Older tesseract releases also emit a separator after the last page.
+        if len(texts) == len(images) + 1 and not texts[-1].strip():
+            texts.pop()
+        if len(texts) == len(images):
+            return [t.strip() for t in texts]
+    return [run_tesseract_stdout_txt(image, lang, psm, dpi, timeout_sec) for image in images]
+
+
+def similarity_tail_key(a_norm: str, b_norm: str) -> tuple[float, float, int]:
+    sim = text_similarity(a_norm, b_norm)
+    if a_norm:
+        len_ratio = len(b_norm) / len(a_norm) if len(a_norm) else 0.0
+        len_closeness = -abs(len_ratio - 1.0)
+    else:
+        len_closeness = -1.0
+    return (sim, len_closeness, len(b_norm))
+
+
 def choose_best_b_text(a_text: str, b_candidates: list[tuple[str, str]]) -> tuple[str, str]:
-    a_norm = normalize_text(a_text)
-    a_has_tib = bool(TIB_RE.search(a_norm))
+    a_feat = text_features(a_text)
+    a_norm = a_feat.norm
+    a_has_tib = a_feat.has_tib
     best = ""
     best_source = ""
-    best_key = (-1, -1, -9999, -1, -1, -1.0, -10.0, -1)
+    best_prefix: tuple[int, int, int, int, int] | None = None
+    best_norm = ""
+    best_tail: tuple[float, float, int] | None = None
+    seen: set[str] = set()
+    # Candidates are ranked by (cheap prefix, similarity tail). The similarity ratio is
+    # only needed to break ties on the prefix, so it is computed lazily.
     for source, bt in b_candidates:
-        b_norm = normalize_text(bt)
-        b_d = len(DIACRITIC_RE.findall(b_norm))
-        sim = difflib.SequenceMatcher(None, a_norm, b_norm).ratio() if a_norm and b_norm else 0.0
-        script_ok = int(not DEV_RE.search(b_norm) and ((not a_has_tib) or bool(TIB_RE.search(b_norm))))
-        b_letters, b_neg_suspects, b_tail_d = roman_tail_quality_score(b_norm)
-        if a_norm:
-            len_ratio = len(b_norm) / len(a_norm) if len(a_norm) else 0.0
-            len_closeness = -abs(len_ratio - 1.0)
-        else:
-            len_closeness = -1.0
+        if bt in seen:
+            # Identical text ranks identically and never beats the earlier candidate.
+            continue
+        seen.add(bt)
+        b_feat = text_features(bt)
+        script_ok = int(not b_feat.has_dev and ((not a_has_tib) or b_feat.has_tib))
         # For Tibetan-headword lines, prioritize cleaner romanization tails.
         if a_has_tib:
-            key = (script_ok, b_letters, b_neg_suspects, b_tail_d, b_d, sim, len_closeness, len(b_norm))
+            b_letters, b_neg_suspects, b_tail_d = b_feat.tail_quality
+            prefix = (script_ok, b_letters, b_neg_suspects, b_tail_d, b_feat.diacritics)
         else:
             # Otherwise: prefer script-safe outputs, then richer diacritics and alignment.
-            key = (script_ok, -1, -9999, -1, b_d, sim, len_closeness, len(b_norm))
-        if key > best_key:
-            best = bt
-            best_source = source
-            best_key = key
+            prefix = (script_ok, -1, -9999, -1, b_feat.diacritics)
+        if best_prefix is not None:
+            if prefix < best_prefix:
+                continue
+            if prefix == best_prefix:
+                if best_tail is None:
+                    best_tail = similarity_tail_key(a_norm, best_norm)
+                if similarity_below(a_norm, b_feat.norm, best_tail[0]):
+                    continue
+                tail = similarity_tail_key(a_norm, b_feat.norm)
+                if tail <= best_tail:
+                    continue
+                best_tail = tail
+            else:
+                best_tail = None
+        best = bt
+        best_source = source
+        best_prefix = prefix
+        best_norm = b_feat.norm
     return best, best_source
 
 
-def make_crop_variants(raw_crop: Path, variants: list[str]) -> list[tuple[str, Path]]:
-    from PIL import Image, ImageOps
+# 0/255 threshold table for the bw180 variant; same pixels as a mode "1" round trip.
+BW180_LUT = [255 if p > 180 else 0 for p in range(256)]
+
+
+def make_crop_variants(raw_crop: Path, img: Image.Image, variants: Iterable[str]) -> list[tuple[str, Path]]:
+    # img is the in-memory crop already saved at raw_crop; variants derive from it
+    # directly instead of decoding the PNG again.
+    from PIL import ImageOps
 
     out: list[tuple[str, Path]] = []
-    with Image.open(raw_crop) as img:
-        for name in variants:
-            if name == "raw":
-                out.append((name, raw_crop))
-                continue
-            if name == "auto":
-                v = ImageOps.autocontrast(ImageOps.grayscale(img))
-            elif name == "bw180":
-                g = ImageOps.autocontrast(ImageOps.grayscale(img))
-                v = g.point(lambda p: 255 if p > 180 else 0, mode="1").convert("L")
-            elif name == "up2x_auto":
-                w, h = img.size
-                up = img.resize((max(1, w * 2), max(1, h * 2)))
-                v = ImageOps.autocontrast(ImageOps.grayscale(up))
-            else:
-                raise RuntimeError(f"Unknown crop variant: {name}")
-            dst = raw_crop.with_name(f"{raw_crop.stem}_{name}.png")
-            v.save(dst)
-            out.append((name, dst))
+    auto = None
+    for name in variants:
+        if name == "raw":
+            out.append((name, raw_crop))
+            continue
+        if name in ("auto", "bw180"):
+            # bw180 thresholds the auto variant; build the autocontrasted grayscale once.
+            if auto is None:
+                auto = ImageOps.autocontrast(ImageOps.grayscale(img))
+            v = auto if name == "auto" else auto.point(BW180_LUT)
+        elif name == "up2x_auto":
+            w, h = img.size
+            up = img.resize((max(1, w * 2), max(1, h * 2)))
+            v = ImageOps.autocontrast(ImageOps.grayscale(up))
+        else:
+            raise RuntimeError(f"Unknown crop variant: {name}")
+        dst = raw_crop.with_name(f"{raw_crop.stem}_{name}.png")
+        v.save(dst)
+        out.append((name, dst))
     return out
 
 
-def render_page_png(pdf: Path, page: int, dpi: int, out_png: Path) -> None:
-    prefix = out_png.with_suffix("")
+def contiguous_page_runs(pages: list[int], max_len: int) -> list[list[int]]:
+    runs: list[list[int]] = []
+    for page in pages:
+        if runs and page == runs[-1][-1] + 1 and len(runs[-1]) < max_len:
+            runs[-1].append(page)
+        else:
+            runs.append([page])
+    return runs
+
+
+def render_pages_png(pdf: Path, first: int, last: int, dpi: int, pages_dir: Path) -> None:
+    """Render pages first..last with one pdftoppm run into pages_dir/pNNNN.png."""
+    prefix = pages_dir / f"render_p{first:04d}"
     run_cmd(
         [
             "pdftoppm",
             "-f",
-            str(page),
+            str(first),
             "-l",
-            str(page),
+            str(last),
             "-r",
             str(dpi),
             "-png",
@@ -1052,14 +1234,15 @@ def render_page_png(pdf: Path, page: int, dpi: int, out_png: Path) -> None:
             str(prefix),
         ]
     )
-    candidates = sorted(out_png.parent.glob(f"{prefix.name}-*.png"))
-    if len(candidates) != 1:
+    # pdftoppm zero-pads the page number to the width of the document's page count.
+    generated = sorted(pages_dir.glob(f"{prefix.name}-*.png"))
+    if len(generated) != last - first + 1:
         raise RuntimeError(
-            f"Expected exactly one rendered page image for prefix {prefix.name}, found {len(candidates)}"
+            f"Expected {last - first + 1} rendered page images for prefix {prefix.name}, found {len(generated)}"
         )
-    generated = candidates[0]
-    if generated != out_png:
-        generated.rename(out_png)
+    for path in generated:
+        page = int(path.stem.rsplit("-", 1)[1])
+        path.rename(pages_dir / f"p{page:04d}.png")
 
 
 def tesseract_hocr(image: Path, lang: str, psm: int, dpi: int, out_hocr: Path) -> None:
@@ -1085,35 +1268,40 @@ def tesseract_hocr(image: Path, lang: str, psm: int, dpi: int, out_hocr: Path) -
         generated.rename(out_hocr)
 
 
-def iter_text(node: ET.Element) -> Iterable[str]:
-    if node.text:
-        yield node.text
-    for child in node:
-        yield from iter_text(child)
-        if child.tail:
-            yield child.tail
+def parse_bbox(title: str) -> tuple[int, int, int, int] | None:
+    # hOCR titles are "bbox x0 y0 x1 y1; baseline ...", so no regex is needed.
+    fields = title.partition("bbox ")[2].split(";", 1)[0].split(" ", 4)[:4]
+    if len(fields) != 4 or not all(f.isdecimal() for f in fields):
+        return None
+    x0, y0, x1, y1 = map(int, fields)
+    return x0, y0, x1, y1
 
 
 def parse_hocr_lines(hocr_path: Path) -> list[dict[str, object]]:
-    xml_text = hocr_path.read_text(errors="replace")
-    # hOCR occasionally includes invalid control chars; strip XML-illegal chars.
-    xml_text = "".join(
-        ch
-        for ch in xml_text
-        if ch in ("\t", "\n", "\r") or ord(ch) >= 0x20
-    )
-    root = ET.fromstring(xml_text)
-    ns = {"x": "http://www.w3.org/1999/xhtml"}
+    # Stream the hOCR and clear each line subtree once read, so the parsed tree never
+    # holds more than the current line's words.
+    parser = ET.XMLPullParser(events=("end",))
     out: list[dict[str, object]] = []
-    for line in root.findall(".//x:span[@class='ocr_line']", ns):
-        title = line.attrib.get("title", "")
-        m = BBOX_RE.search(title)
-        if not m:
-            continue
-        x0, y0, x1, y1 = map(int, m.groups())
-        text = normalize_text("".join(iter_text(line)))
-        out.append({"bbox": (x0, y0, x1, y1), "text": text})
-    return out
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with hocr_path.open("rb") as f:
+        while True:
+            chunk = f.read(1 << 16)
+            if chunk:
+                # hOCR occasionally includes invalid control chars; strip XML-illegal chars.
+                parser.feed(decoder.decode(chunk.translate(None, XML_ILLEGAL_BYTES)))
+            else:
+                parser.feed(decoder.decode(b"", final=True))
+                parser.close()
+            for _, line in parser.read_events():
+                if line.tag != HOCR_SPAN_TAG or line.get("class") != "ocr_line":
+                    continue
+                bbox = parse_bbox(line.get("title", ""))
+                if bbox is not None:
+                    text = normalize_text("".join(line.itertext()))
+                    out.append({"bbox": bbox, "text": text})
+                line.clear()
+            if not chunk:
+                return out
 
 
 def line_is_candidate(text: str) -> bool:
@@ -1133,19 +1321,39 @@ def clamp(v: int, lo: int, hi: int) -> int:
     return max(lo, min(hi, v))
 
 
-def crop_image(src: Path, dst: Path, bbox: tuple[int, int, int, int], pad: int) -> None:
-    x0, y0, x1, y1 = bbox
+def ocr_page_pass_a(page: int, dpi: int, lang: str, psm: int, pages_dir: Path) -> tuple[Path, list[dict[str, object]]]:
+    page_tag = f"p{page:04d}"
+    png = pages_dir / f"{page_tag}.png"
+    hocr = pages_dir / f"{page_tag}_A.hocr"
+    tesseract_hocr(png, lang, psm, dpi, hocr)
+    return png, parse_hocr_lines(hocr)
+
+
+def image_digest(path: Path) -> bytes:
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).digest()
+
+
+def open_page_image(png: Path) -> Image.Image:
     from PIL import Image
 
-    with Image.open(src) as img:
-        w, h = img.size
-        cx0 = clamp(x0 - pad, 0, w)
-        cy0 = clamp(y0 - pad, 0, h)
-        cx1 = clamp(x1 + pad, 0, w)
-        cy1 = clamp(y1 + pad, 0, h)
-        if cx1 <= cx0 or cy1 <= cy0:
-            raise RuntimeError(f"Invalid crop box: {(x0, y0, x1, y1)}")
-        img.crop((cx0, cy0, cx1, cy1)).save(dst)
+    # Decode once; every candidate line on the page is cropped from this image.
+    img = Image.open(png)
+    img.load()
+    return img
+
+
+def crop_image(page_img: Image.Image, dst: Path, bbox: tuple[int, int, int, int], pad: int) -> Image.Image:
+    x0, y0, x1, y1 = bbox
+    w, h = page_img.size
+    cx0 = clamp(x0 - pad, 0, w)
+    cy0 = clamp(y0 - pad, 0, h)
+    cx1 = clamp(x1 + pad, 0, w)
+    cy1 = clamp(y1 + pad, 0, h)
+    if cx1 <= cx0 or cy1 <= cy0:
+        raise RuntimeError(f"Invalid crop box: {(x0, y0, x1, y1)}")
+    crop = page_img.crop((cx0, cy0, cx1, cy1))
+    crop.save(dst)
+    return crop
 
 
 def should_replace(
@@ -1155,31 +1363,33 @@ def should_replace(
     min_similarity_diacritic_only: float,
     min_similarity_tibetan_anchor: float,
 ) -> tuple[bool, str, float, int, int]:
-    a = normalize_text(a_text)
-    b = normalize_text(b_text)
+    a_feat = text_features(a_text)
+    b_feat = text_features(b_text)
+    a = a_feat.norm
+    b = b_feat.norm
     if not b:
         return False, "empty_b", 0.0, 0, 0
-    if DEV_RE.search(b):
+    if b_feat.has_dev:
         return False, "unexpected_devanagari", 0.0, 0, 0
     # Guard against OCR confusable letters outside project transliteration conventions.
     if UNSUPPORTED_LATIN_OCR_CHAR_RE.search(b) and not UNSUPPORTED_LATIN_OCR_CHAR_RE.search(a):
         return False, "unsupported_latin_char", 0.0, 0, 0
     # Keep true Tibetan script loss blocked, but do not hard-block on isolated Tibetan
     # digit artifacts embedded in otherwise Latin/transliteration lines.
-    a_has_tib_non_digit = bool(re.search(r"[\u0F00-\u0F1F\u0F2A-\u0FFF]", a))
-    a_starts_tib_digit = bool(re.match(r"^\s*[\u0F20-\u0F29]", a))
-    b_starts_digit = bool(re.match(r"^\s*[\u0F20-\u0F290-9]", b))
+    a_has_tib_non_digit = bool(TIB_NON_DIGIT_RE.search(a))
+    a_starts_tib_digit = bool(TIB_DIGIT_START_RE.match(a))
+    b_starts_digit = bool(TIB_OR_ASCII_DIGIT_START_RE.match(b))
     if a_starts_tib_digit and not b_starts_digit:
         return False, "lost_tibetan_script", 0.0, 0, 0
-    if a_has_tib_non_digit and not TIB_RE.search(b):
+    if a_has_tib_non_digit and not b_feat.has_tib:
         return False, "lost_tibetan_script", 0.0, 0, 0
-    a_d = len(DIACRITIC_RE.findall(a))
-    b_d = len(DIACRITIC_RE.findall(b))
+    a_d = a_feat.diacritics
+    b_d = b_feat.diacritics
     if a:
         length_ratio = len(b) / len(a)
         if length_ratio < 0.5 or length_ratio > 1.8:
             return False, "length_ratio_out_of_range", 0.0, a_d, b_d
-    similarity = difflib.SequenceMatcher(None, a, b).ratio() if a and b else 0.0
+    similarity = text_similarity(a, b)
     if b_d > a_d:
         if similarity < min_similarity:
             if similarity < min_similarity_diacritic_only:
@@ -1233,8 +1443,8 @@ def should_replace(
             and a_anchor == b_anchor
             and similarity >= min_similarity_tibetan_anchor
         ):
-            a_q = roman_tail_quality_score(a)
-            b_q = roman_tail_quality_score(b)
+            a_q = a_feat.tail_quality
+            b_q = b_feat.tail_quality
             a_noise = roman_tail_noise_score(a)
             b_noise = roman_tail_noise_score(b)
             if b_q > a_q and (
@@ -1256,6 +1466,257 @@ def should_replace(
     return True, "replace", similarity, a_d, b_d
 
 
+@dataclass(frozen=True)
+class PageRunSettings:
+    pdf: Path
+    pages_dir: Path
+    dpi: int
+    lang_a: str
+    psm_a: int
+    lang_b: str
+    psm_b_values: tuple[int, ...]
+    psm_b_values_tib: tuple[int, ...]
+    crop_variants: tuple[str, ...]
+    candidate_mode: str
+    line_timeout_sec: float
+    min_similarity: float
+    min_similarity_diacritic_only: float
+    min_similarity_tibetan_anchor: float
+    early_accept_similarity: float
+    jobs: int
+    anomaly_report: bool
+    dehyphenate_wrap: bool
+
+
+@dataclass
+class PageResult:
+    page: int
+    merged_text: str
+    summary_row: dict[str, object]
+    audit_rows: list[dict[str, object]]
+    anomaly_rows: list[dict[str, object]]
+
+
+def process_pages(pages: list[int], settings: PageRunSettings) -> Iterator[PageResult]:
+    """Run Pass A, Pass B and the merge cleanup over pages, yielding results in page order."""
+    ocr_cache: dict[tuple[bytes, int], str] = {}
+    with ThreadPoolExecutor(max_workers=settings.jobs) as pool:
+
+        # Consecutive pages render in one pdftoppm run. Pass A tasks run one page at a time,
+        # so the task for the first page of a run renders the whole run for the pages after it.
+        render_run_by_first_page = {run[0]: run for run in contiguous_page_runs(pages, RENDER_BATCH_PAGES)}
+
+        def pass_a_task(page: int) -> tuple[Image.Image, list[dict[str, object]]]:
+            run = render_run_by_first_page.get(page)
+            if run:
+                render_pages_png(settings.pdf, run[0], run[-1], settings.dpi, settings.pages_dir)
+            png, lines = ocr_page_pass_a(page, settings.dpi, settings.lang_a, settings.psm_a, settings.pages_dir)
+            return open_page_image(png), lines
+
+        def submit_pass_a(page: int) -> Future[tuple[Image.Image, list[dict[str, object]]]]:
+            return pool.submit(pass_a_task, page)
+
+        # Render and run Pass A for the next page while this page's line crops are in Pass B.
+        next_pass_a = submit_pass_a(pages[0]) if pages else None
+        for page_pos, page in enumerate(pages):
+            page_tag = f"p{page:04d}"
+            page_img, lines = next_pass_a.result()
+            if page_pos + 1 < len(pages):
+                next_pass_a = submit_pass_a(pages[page_pos + 1])
+
+            page_total = len(lines)
+            page_candidates = 0
+            page_replaced = 0
+            raw_final_lines: list[str] = []
+            page_audit_meta: list[dict[str, object]] = []
+
+            # Crop every candidate line first so Pass B can OCR the page's crops in a few
+            # batched tesseract runs per PSM instead of one process per crop.
+            candidate_lines = [
+                (idx, line)
+                for idx, line in enumerate(lines, start=1)
+                if (
+                    line_is_candidate(str(line["text"]))
+                    if settings.candidate_mode == "heuristic"
+                    else bool(LATIN_RE.search(str(line["text"])))
+                )
+            ]
+
+            def crop_line_variants(item: tuple[int, dict[str, object]]) -> list[tuple[str, Path, bytes]]:
+                idx, line = item
+                crop_path = settings.pages_dir / f"{page_tag}_l{idx:04d}.png"
+                crop = crop_image(page_img, crop_path, line["bbox"], pad=4)
+                return [
+                    (var_name, var_path, image_digest(var_path))
+                    for var_name, var_path in make_crop_variants(crop_path, crop, settings.crop_variants)
+                ]
+
+            # Pass B jobs per candidate line, grouped by crop variant in --crop-variants order.
+            line_b_jobs: dict[int, list[list[tuple[str, Path, tuple[bytes, int]]]]] = {}
+            for (idx, line), variants in zip(candidate_lines, pool.map(crop_line_variants, candidate_lines)):
+                psm_values_this_line = settings.psm_b_values_tib if TIB_RE.search(str(line["text"])) else settings.psm_b_values
+                line_b_jobs[idx] = [
+                    [(f"{var_name}_psm{psm_b}", var_path, (digest, psm_b)) for psm_b in psm_values_this_line]
+                    for var_name, var_path, digest in variants
+                ]
+
+            def ocr_uncached(b_jobs: Iterable[tuple[str, Path, tuple[bytes, int]]]) -> None:
+                # OCR each distinct crop once per PSM; repeats on this or earlier pages hit the cache.
+                pending_by_psm: dict[int, dict[bytes, Path]] = {}
+                for _, var_path, ocr_key in b_jobs:
+                    if ocr_key not in ocr_cache:
+                        digest, psm_b = ocr_key
+                        pending_by_psm.setdefault(psm_b, {}).setdefault(digest, var_path)
+                batches: list[tuple[int, list[tuple[bytes, Path]], Path]] = []
+                for psm_b, pending in pending_by_psm.items():
+                    images = list(pending.items())
+                    n_batches = max(1, min(settings.jobs, len(images) // MIN_B_BATCH_CROPS))
+                    for k in range(n_batches):
+                        chunk = images[len(images) * k // n_batches : len(images) * (k + 1) // n_batches]
+                        batches.append((psm_b, chunk, settings.pages_dir / f"{page_tag}_B_psm{psm_b}_{k:02d}.txt"))
+                for (psm_b, chunk, _), texts in zip(
+                    batches,
+                    pool.map(
+                        lambda batch: run_tesseract_batch_txt(
+                            [image for _, image in batch[1]],
+                            settings.lang_b,
+                            batch[0],
+                            settings.dpi,
+                            settings.line_timeout_sec,
+                            batch[2],
+                        ),
+                        batches,
+                    ),
+                ):
+                    ocr_cache.update(((digest, psm_b), text) for (digest, _), text in zip(chunk, texts))
+
+            def b_candidates_for(idx: int, n_variants: int) -> list[tuple[str, str]]:
+                return [
+                    (source, ocr_cache[ocr_key])
+                    for variant_jobs in line_b_jobs[idx][:n_variants]
+                    for source, _, ocr_key in variant_jobs
+                ]
+
+            line_b_variants = {idx: len(groups) for idx, groups in line_b_jobs.items()}
+            if settings.early_accept_similarity > 0:
+                # OCR one crop variant at a time and stop for lines whose best candidate so
+                # far is already accepted at or above the early-accept similarity.
+                open_lines = list(line_b_jobs)
+                for n_variants in range(1, len(settings.crop_variants) + 1):
+                    ocr_uncached(job for idx in open_lines for job in line_b_jobs[idx][n_variants - 1])
+                    still_open = []
+                    for idx in open_lines:
+                        a_text = str(lines[idx - 1]["text"])
+                        b_text, _ = choose_best_b_text(a_text, b_candidates_for(idx, n_variants))
+                        use_b, _, similarity, _, _ = should_replace(
+                            a_text,
+                            b_text,
+                            settings.min_similarity,
+                            settings.min_similarity_diacritic_only,
+                            settings.min_similarity_tibetan_anchor,
+                        )
+                        if use_b and similarity >= settings.early_accept_similarity:
+                            line_b_variants[idx] = n_variants
+                        else:
+                            still_open.append(idx)
+                    open_lines = still_open
+                    if not open_lines:
+                        break
+            else:
+                ocr_uncached(job for groups in line_b_jobs.values() for variant_jobs in groups for job in variant_jobs)
+
+            for idx, line in enumerate(lines, start=1):
+                a_text = str(line["text"])
+                use_b = False
+                b_text = ""
+                reason = "non_candidate"
+                similarity = 0.0
+                a_d = len(DIACRITIC_RE.findall(a_text))
+                b_d = 0
+
+                is_candidate = idx in line_b_jobs
+                if is_candidate:
+                    page_candidates += 1
+                    b_candidates = b_candidates_for(idx, line_b_variants[idx])
+                    b_text, b_source = choose_best_b_text(a_text, b_candidates)
+                    use_b, reason, similarity, a_d, b_d = should_replace(
+                        a_text,
+                        b_text,
+                        settings.min_similarity,
+                        settings.min_similarity_diacritic_only,
+                        settings.min_similarity_tibetan_anchor,
+                    )
+                    if not use_b and reason == "lost_tibetan_script":
+                        spliced = maybe_splice_tibetan_prefix_with_b_tail(a_text, b_text, settings.min_similarity_tibetan_anchor)
+                        if spliced:
+                            use_b = True
+                            reason = "replace_splice_tibetan_prefix_b_tail"
+                            b_text = spliced
+                            b_source = f"{b_source}+splice" if b_source else "splice"
+                            b_d = len(DIACRITIC_RE.findall(b_text))
+                else:
+                    b_source = ""
+
+                final_text = b_text if use_b else a_text
+                if use_b:
+                    page_replaced += 1
+                raw_final_lines.append(final_text)
+                page_audit_meta.append(
+                    {
+                        "page": page,
+                        "line": idx,
+                        "candidate": int(is_candidate),
+                        "replaced": int(use_b),
+                        "reason": reason,
+                        "similarity": f"{similarity:.4f}",
+                        "a_diacritics": a_d,
+                        "b_diacritics": b_d,
+                        "a_text": a_text,
+                        "b_text": b_text,
+                        "b_source": b_source,
+                    }
+                )
+
+            page_img.close()
+            while len(ocr_cache) > OCR_CACHE_MAX_ENTRIES:
+                del ocr_cache[next(iter(ocr_cache))]
+
+            zones_per_line = page_line_zones(raw_final_lines)
+            merged_lines = [post_cleanup_contextual(zones_per_line, i, text) for i, text in enumerate(raw_final_lines)]
+            anomaly_rows: list[dict[str, object]] = []
+            if settings.anomaly_report:
+                for i, final_text in enumerate(merged_lines, start=1):
+                    anomaly_rows.extend(collect_anomalies(page, i, final_text))
+
+            audit_rows: list[dict[str, object]] = []
+            for meta, final_text in zip(page_audit_meta, merged_lines):
+                row = dict(meta)
+                row["final_text"] = final_text
+                audit_rows.append(row)
+
+            if settings.dehyphenate_wrap:
+                merged_lines = dehyphenate_wrapped_lines(merged_lines)
+            yield PageResult(
+                page=page,
+                merged_text="\n".join(merged_lines),
+                summary_row={
+                    "page": page,
+                    "lines_total": page_total,
+                    "lines_candidate": page_candidates,
+                    "lines_replaced": page_replaced,
+                    "replace_rate_candidates": f"{(page_replaced / page_candidates):.4f}" if page_candidates else "0.0000",
+                },
+                audit_rows=audit_rows,
+                anomaly_rows=anomaly_rows,
+            )
+
+
+def process_page_chunk(pages: list[int], settings: PageRunSettings) -> list[PageResult]:
+    # --page-workers entry point: each chunk runs in its own process with its own
+    # thread pool and OCR cache.
+    return list(process_pages(pages, settings))
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("pdf", help="Input PDF path")
@@ -1297,7 +1758,28 @@ def main() -> int:
         default=0.73,
         help="Lower threshold when Tibetan-script anchor matches after tsheg/shad/digit normalization.",
     )
+    ap.add_argument(
+        "--early-accept-similarity",
+        type=float,
+        default=0.0,
+        help=(
+            "OCR crop variants one at a time in --crop-variants order and stop for a line once its B text "
+            "is accepted at this similarity or higher (e.g. 0.95). 0 disables and OCRs every variant."
+        ),
+    )
     ap.add_argument("--line-timeout-sec", type=float, default=20.0, help="Per-line tesseract timeout in seconds")
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker threads per page process for cropping, rendering and batched Pass-B tesseract runs.",
+    )
+    ap.add_argument(
+        "--page-workers",
+        type=int,
+        default=1,
+        help="Processes working on separate runs of pages; each uses its own --jobs threads.",
+    )
     ap.add_argument(
         "--candidate-mode",
         choices=["heuristic", "all_latin"],
@@ -1355,114 +1837,32 @@ def main() -> int:
     if not crop_variants:
         raise SystemExit("No valid --crop-variants values")
 
-    merged_pages: list[str] = []
-    summary_rows: list[dict[str, object]] = []
-    audit_rows: list[dict[str, object]] = []
-    anomaly_rows: list[dict[str, object]] = []
-
-    for page in pages:
-        page_tag = f"p{page:04d}"
-        png = pages_dir / f"{page_tag}.png"
-        hocr = pages_dir / f"{page_tag}_A.hocr"
-        render_page_png(pdf, page, args.dpi, png)
-        tesseract_hocr(png, args.lang_a, args.psm_a, args.dpi, hocr)
-        lines = parse_hocr_lines(hocr)
-
-        page_total = len(lines)
-        page_candidates = 0
-        page_replaced = 0
-        raw_final_lines: list[str] = []
-        page_audit_meta: list[dict[str, object]] = []
-
-        for idx, line in enumerate(lines, start=1):
-            a_text = str(line["text"])
-            bbox = line["bbox"]
-            use_b = False
-            b_text = ""
-            reason = "non_candidate"
-            similarity = 0.0
-            a_d = len(DIACRITIC_RE.findall(a_text))
-            b_d = 0
-
-            is_candidate = line_is_candidate(a_text) if args.candidate_mode == "heuristic" else bool(LATIN_RE.search(a_text))
-            if is_candidate:
-                page_candidates += 1
-                crop_path = pages_dir / f"{page_tag}_l{idx:04d}.png"
-                crop_image(png, crop_path, bbox, pad=4)
-                variant_paths = make_crop_variants(crop_path, crop_variants)
-                b_candidates: list[tuple[str, str]] = []
-                psm_values_this_line = psm_b_values_tib if TIB_RE.search(a_text) else psm_b_values
-                for var_name, var_path in variant_paths:
-                    for psm_b in psm_values_this_line:
-                        source = f"{var_name}_psm{psm_b}"
-                        bt = run_tesseract_stdout_txt(var_path, args.lang_b, psm_b, args.dpi, args.line_timeout_sec)
-                        b_candidates.append((source, bt))
-                b_text, b_source = choose_best_b_text(a_text, b_candidates)
-                use_b, reason, similarity, a_d, b_d = should_replace(
-                    a_text,
-                    b_text,
-                    args.min_similarity,
-                    args.min_similarity_diacritic_only,
-                    args.min_similarity_tibetan_anchor,
-                )
-                if not use_b and reason == "lost_tibetan_script":
-                    spliced = maybe_splice_tibetan_prefix_with_b_tail(a_text, b_text, args.min_similarity_tibetan_anchor)
-                    if spliced:
-                        use_b = True
-                        reason = "replace_splice_tibetan_prefix_b_tail"
-                        b_text = spliced
-                        b_source = f"{b_source}+splice" if b_source else "splice"
-                        b_d = len(DIACRITIC_RE.findall(b_text))
-            else:
-                b_source = ""
-
-            final_text = b_text if use_b else a_text
-            if use_b:
-                page_replaced += 1
-            raw_final_lines.append(final_text)
-            page_audit_meta.append(
-                {
-                    "page": page,
-                    "line": idx,
-                    "candidate": int(is_candidate),
-                    "replaced": int(use_b),
-                    "reason": reason,
-                    "similarity": f"{similarity:.4f}",
-                    "a_diacritics": a_d,
-                    "b_diacritics": b_d,
-                    "a_text": a_text,
-                    "b_text": b_text,
-                    "b_source": b_source,
-                }
-            )
-
-        merged_lines = [post_cleanup_contextual(raw_final_lines, i, text) for i, text in enumerate(raw_final_lines)]
-        if args.anomaly_report:
-            for i, final_text in enumerate(merged_lines, start=1):
-                anomaly_rows.extend(collect_anomalies(page, i, final_text))
-
-        for meta, final_text in zip(page_audit_meta, merged_lines):
-            row = dict(meta)
-            row["final_text"] = final_text
-            audit_rows.append(row)
-
-        if args.dehyphenate_wrap:
-            merged_lines = dehyphenate_wrapped_lines(merged_lines)
-        merged_page_text = "\n".join(merged_lines)
-        merged_pages.append(merged_page_text)
-        summary_rows.append(
-            {
-                "page": page,
-                "lines_total": page_total,
-                "lines_candidate": page_candidates,
-                "lines_replaced": page_replaced,
-                "replace_rate_candidates": f"{(page_replaced / page_candidates):.4f}" if page_candidates else "0.0000",
-            }
-        )
-        print(
-            f"page={page} lines={page_total} candidates={page_candidates} replaced={page_replaced}",
-            file=sys.stderr,
-        )
+    jobs = max(1, args.jobs)
+    page_workers = max(1, args.page_workers)
+    if jobs > 1 or page_workers > 1:
+        # Each tesseract call is single-page line OCR; let the pools provide the parallelism
+        # instead of oversubscribing cores with OpenMP threads inside every process.
+        os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    settings = PageRunSettings(
+        pdf=pdf,
+        pages_dir=pages_dir,
+        dpi=args.dpi,
+        lang_a=args.lang_a,
+        psm_a=args.psm_a,
+        lang_b=args.lang_b,
+        psm_b_values=tuple(psm_b_values),
+        psm_b_values_tib=tuple(psm_b_values_tib),
+        crop_variants=tuple(crop_variants),
+        candidate_mode=args.candidate_mode,
+        line_timeout_sec=args.line_timeout_sec,
+        min_similarity=args.min_similarity,
+        min_similarity_diacritic_only=args.min_similarity_diacritic_only,
+        min_similarity_tibetan_anchor=args.min_similarity_tibetan_anchor,
+        early_accept_similarity=args.early_accept_similarity,
+        jobs=jobs,
+        anomaly_report=args.anomaly_report,
+        dehyphenate_wrap=args.dehyphenate_wrap,
+    )
 
     stem = pdf.stem
     if args.all_pages:
@@ -1480,12 +1880,17 @@ def main() -> int:
     anomaly_out = outdir / f"{stem}_lineanchored_anomalies.csv"
 
     page_sep = "\f" if args.page_separator == "formfeed" else "\n\n<<<PAGE_BREAK>>>\n\n"
-    merged_out.write_text(page_sep.join(merged_pages))
     pages_out.write_text("\n".join(str(p) for p in pages) + "\n")
 
-    with summary_out.open("w", newline="") as f:
-        w = csv.DictWriter(
-            f,
+    total_lines = 0
+    total_candidates = 0
+    total_replaced = 0
+    # Write each page's merged text and CSV rows as soon as it is done, so memory
+    # stays at one page of audit rows even on full-volume runs.
+    with ExitStack() as stack:
+        merged_f = stack.enter_context(merged_out.open("w"))
+        summary_w = csv.DictWriter(
+            stack.enter_context(summary_out.open("w", newline="")),
             fieldnames=[
                 "page",
                 "lines_total",
@@ -1494,12 +1899,9 @@ def main() -> int:
                 "replace_rate_candidates",
             ],
         )
-        w.writeheader()
-        w.writerows(summary_rows)
-
-    with audit_out.open("w", newline="") as f:
-        w = csv.DictWriter(
-            f,
+        summary_w.writeheader()
+        audit_w = csv.DictWriter(
+            stack.enter_context(audit_out.open("w", newline="")),
             fieldnames=[
                 "page",
                 "line",
@@ -1515,13 +1917,11 @@ def main() -> int:
                 "final_text",
             ],
         )
-        w.writeheader()
-        w.writerows(audit_rows)
-
-    if args.anomaly_report:
-        with anomaly_out.open("w", newline="") as f:
-            w = csv.DictWriter(
-                f,
+        audit_w.writeheader()
+        anomaly_w = None
+        if args.anomaly_report:
+            anomaly_w = csv.DictWriter(
+                stack.enter_context(anomaly_out.open("w", newline="")),
                 fieldnames=[
                     "page",
                     "line",
@@ -1531,12 +1931,35 @@ def main() -> int:
                     "zones",
                 ],
             )
-            w.writeheader()
-            w.writerows(anomaly_rows)
+            anomaly_w.writeheader()
+
+        with ProcessPoolExecutor(max_workers=page_workers) if page_workers > 1 else nullcontext() as page_pool:
+            if page_pool is None:
+                results: Iterable[PageResult] = process_pages(pages, settings)
+            else:
+                # Hand out runs of consecutive pages (one pdftoppm call each), small enough
+                # to keep every worker busy; map() keeps the results in page order.
+                chunk_len = min(RENDER_BATCH_PAGES, -(-len(pages) // page_workers))
+                chunks = contiguous_page_runs(pages, chunk_len)
+                results = chain.from_iterable(page_pool.map(partial(process_page_chunk, settings=settings), chunks))
+            for page_pos, result in enumerate(results):
+                if page_pos:
+                    merged_f.write(page_sep)
+                merged_f.write(result.merged_text)
+                row = result.summary_row
+                summary_w.writerow(row)
+                audit_w.writerows(result.audit_rows)
+                if anomaly_w is not None:
+                    anomaly_w.writerows(result.anomaly_rows)
+                total_lines += int(row["lines_total"])
+                total_candidates += int(row["lines_candidate"])
+                total_replaced += int(row["lines_replaced"])
+                print(
+                    f"page={result.page} lines={row['lines_total']} candidates={row['lines_candidate']} "
+                    f"replaced={row['lines_replaced']}",
+                    file=sys.stderr,
+                )
 
-    total_lines = sum(int(r["lines_total"]) for r in summary_rows)
-    total_candidates = sum(int(r["lines_candidate"]) for r in summary_rows)
-    total_replaced = sum(int(r["lines_replaced"]) for r in summary_rows)
     print(f"pdf={pdf}")
     print(f"pages={len(pages)}")
     print(f"lines_total={total_lines}")
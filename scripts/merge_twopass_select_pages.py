@@ -5,10 +5,24 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
+from typing import Iterator
 
 
-def read_pages(path: str) -> list[str]:
-    return Path(path).read_text(errors="replace").split("\f")
+def iter_pages(path: str, chunk_size: int = 1 << 20) -> Iterator[str]:
+    # Yield form-feed separated pages while reading the file in chunks, so only the
+    # current page is held in memory.
+    with open(path, errors="replace") as f:
+        parts: list[str] = []
+        while chunk := f.read(chunk_size):
+            pieces = chunk.split("\f")
+            if len(pieces) == 1:
+                parts.append(chunk)
+                continue
+            parts.append(pieces[0])
+            yield "".join(parts)
+            yield from pieces[1:-1]
+            parts = [pieces[-1]]
+        yield "".join(parts)
 
 
 def read_page_set(path: str) -> set[int]:
@@ -33,26 +47,28 @@ def main() -> int:
     ap.add_argument("--log", required=True)
     args = ap.parse_args()
 
-    a = read_pages(args.pass_a)
-    b = read_pages(args.pass_b)
-    n = min(len(a), len(b))
     b_pages = read_page_set(args.b_pages)
 
-    merged: list[str] = []
-    log_lines: list[str] = []
-
-    for i in range(1, n + 1):
-        src = "B" if i in b_pages else "A"
-        merged.append(b[i - 1] if src == "B" else a[i - 1])
-        log_lines.append(f"{i},{src}")
-
     Path(args.out).parent.mkdir(parents=True, exist_ok=True)
-    Path(args.out).write_text("\f".join(merged))
+    n = 0
+    from_b = 0
+    log_lines: list[str] = []
+    # Walk both passes page by page (stopping at the shorter one) and write the
+    # chosen page straight to the output.
+    with open(args.out, "w") as out:
+        for i, (a_page, b_page) in enumerate(zip(iter_pages(args.pass_a), iter_pages(args.pass_b)), start=1):
+            src = "B" if i in b_pages else "A"
+            if i > 1:
+                out.write("\f")
+            out.write(b_page if src == "B" else a_page)
+            log_lines.append(f"{i},{src}")
+            n = i
+            from_b += src == "B"
     Path(args.log).write_text("\n".join(log_lines) + "\n")
 
     print(f"pages={n}")
-    print(f"from_B={sum(1 for i in range(1, n + 1) if i in b_pages)}")
-    print(f"from_A={n - sum(1 for i in range(1, n + 1) if i in b_pages)}")
+    print(f"from_B={from_b}")
+    print(f"from_A={n - from_b}")
     print(f"out={args.out}")
     print(f"log={args.log}")
     return 0
@@ -3,9 +3,11 @@ from __future__ import annotations
 
 import argparse
 import csv
+import os
 import re
 import unicodedata
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -17,6 +19,8 @@ LATIN_TOKEN_RE = re.compile(
 ROMAN_CUE_RE = re.compile(r"[āīūṛṝḷḹṅñṭḍṇśṣḥṃṁź'’]|(?:kh|tsh|ts|ph|th|dh|bh|dz|rdz)", re.IGNORECASE)
 TOKEN_VALID_RE = re.compile(r"^[a-zāīūṛṝḷḹṅñṭḍṇśṣḥṃṁź'’\-]+$")
 NVAR_RE = re.compile(r"[nñṅ]")
+WS_RUN_RE = re.compile(r"\s+")
+WINDOW_STOP_RE = re.compile(r"[\"“”;()\[\]]")
 PROTECTED_NY = {"sñan", "ñan", "ñon", "gñan"}
 
 
@@ -29,10 +33,19 @@ class TokenStats:
     n_not_before_ie_count: int = 0
     example: str = ""
 
+    def merge(self, other: TokenStats) -> None:
+        self.count += other.count
+        self.tib_nga_lines += other.tib_nga_lines
+        self.tib_nya_lines += other.tib_nya_lines
+        self.n_before_ie_count += other.n_before_ie_count
+        self.n_not_before_ie_count += other.n_not_before_ie_count
+        if not self.example:
+            self.example = other.example
+
 
 def normalize_line(s: str) -> str:
-    s = unicodedata.normalize("NFC", s).replace("\f", " ")
-    return re.sub(r"\s+", " ", s.strip())
+    s = s.replace("\f", " ")
+    return WS_RUN_RE.sub(" ", s.strip())
 
 
 def is_tibetan_translit_line(line: str) -> bool:
@@ -48,30 +61,27 @@ def iter_translit_windows(line: str):
         if not rest:
             continue
         # Stop at likely prose/citation boundaries.
-        cut = len(rest)
-        for delim in ['"', "“", "”", ";", "(", ")", "[", "]"]:
-            i = rest.find(delim)
-            if i != -1:
-                cut = min(cut, i)
-        window = rest[:cut].strip()
+        cut = WINDOW_STOP_RE.search(rest)
+        window = (rest[: cut.start()] if cut else rest).strip()
         if window:
             yield window
 
 
-def has_n_variant_context(tok: str) -> bool:
-    return bool(NVAR_RE.search(tok.lower()))
+# The token helpers below take `tok_l`: the token already lowercased with ’ folded
+# to ', as computed once per token in scan_file.
+
+
+def has_n_variant_context(tok_l: str) -> bool:
+    return bool(NVAR_RE.search(tok_l))
 
 
-def canon_key(tok: str) -> str:
+def canon_key(tok_l: str) -> str:
     # Collapse n/ñ/ṅ so variants land in one group.
-    t = unicodedata.normalize("NFC", tok).lower()
-    t = t.replace("ñ", "n").replace("ṅ", "n")
-    t = t.replace("’", "'")
-    return t
+    return tok_l.replace("ñ", "n").replace("ṅ", "n")
 
 
-def n_pos_counts(tok: str) -> tuple[int, int]:
-    t = tok.lower().replace("’", "'")
+def n_pos_counts(tok_l: str) -> tuple[int, int]:
+    t = tok_l
     b_ie = 0
     not_ie = 0
     for i, ch in enumerate(t):
@@ -124,6 +134,64 @@ def risk_label(src: str, dst: str, src_st: TokenStats, dst_st: TokenStats) -> st
     return "review"
 
 
+def iter_nfc_lines(path: Path):
+    # Stream the file instead of holding it (and a split copy) in memory. Each physical
+    # line is NFC-normalized on its own, which matches normalizing the whole text since
+    # line breaks are starters; splitlines() then also breaks on the other separators
+    # (\x0b, \x1c, \x85, \u2028, ...) exactly as splitting the whole text did.
+    with path.open(encoding="utf-8", errors="replace", buffering=1 << 20) as fh:
+        for physical_line in fh:
+            yield from unicodedata.normalize("NFC", physical_line).splitlines()
+
+
+def scan_file(
+    path: Path,
+    groups: defaultdict[str, Counter[str]] | None = None,
+    stats: defaultdict[tuple[str, str], TokenStats] | None = None,
+) -> tuple[defaultdict[str, Counter[str]], defaultdict[tuple[str, str], TokenStats]]:
+    """Add one file's n-variant token counts and evidence, into `groups`/`stats` when given."""
+    if groups is None:
+        groups = defaultdict(Counter)
+    if stats is None:
+        stats = defaultdict(TokenStats)
+    # Lines arrive NFC-normalized; tokens sliced from them need no further normalizing.
+    for raw in iter_nfc_lines(path):
+        # Lines without Tibetan never qualify; drop them before normalizing.
+        if not TIB_RE.search(raw):
+            continue
+        line = normalize_line(raw)
+        if not line or not is_tibetan_translit_line(line):
+            continue
+        line_has_nga = "ང" in line
+        line_has_nya = "ཉ" in line
+        for window in iter_translit_windows(line):
+            for m in LATIN_TOKEN_RE.finditer(window):
+                tok = m.group(0)
+                tok_l = tok.lower().replace("’", "'")
+                if len(tok_l) < 3 or not TOKEN_VALID_RE.fullmatch(tok_l):
+                    continue
+                if tok_l in PROTECTED_NY:
+                    continue
+                if not has_n_variant_context(tok_l):
+                    continue
+                key = canon_key(tok_l)
+                if len(key) < 3:
+                    continue
+                groups[key][tok_l] += 1
+                st = stats[(key, tok_l)]
+                st.count += 1
+                if line_has_nga:
+                    st.tib_nga_lines += 1
+                if line_has_nya:
+                    st.tib_nya_lines += 1
+                b_ie, not_ie = n_pos_counts(tok_l)
+                st.n_before_ie_count += b_ie
+                st.n_not_before_ie_count += not_ie
+                if not st.example:
+                    st.example = line
+    return groups, stats
+
+
 def main() -> None:
     ap = argparse.ArgumentParser(description="Build safe-review candidates for n/ñ/ṅ normalization in Tibetan transliteration.")
     ap.add_argument("inputs", nargs="+", help="Input merged OCR text files")
@@ -131,44 +199,24 @@ def main() -> None:
     ap.add_argument("--min-group-total", type=int, default=3)
     ap.add_argument("--mode", choices=["general", "n_to_dot_only"], default="general")
     ap.add_argument("--min-nga-evidence", type=int, default=3)
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Input files scanned in parallel.")
     args = ap.parse_args()
 
-    groups: dict[str, Counter[str]] = defaultdict(Counter)
-    stats: dict[tuple[str, str], TokenStats] = defaultdict(TokenStats)
-
-    for p in [Path(x) for x in args.inputs]:
-        text = p.read_text(encoding="utf-8", errors="replace")
-        for raw in text.splitlines():
-            line = normalize_line(raw)
-            if not line or not is_tibetan_translit_line(line):
-                continue
-            line_has_nga = "ང" in line
-            line_has_nya = "ཉ" in line
-            for window in iter_translit_windows(line):
-                for m in LATIN_TOKEN_RE.finditer(window):
-                    tok = m.group(0)
-                    tok_l = tok.lower().replace("’", "'")
-                    if len(tok_l) < 3 or not TOKEN_VALID_RE.fullmatch(tok_l):
-                        continue
-                    if tok_l in PROTECTED_NY:
-                        continue
-                    if not has_n_variant_context(tok_l):
-                        continue
-                    key = canon_key(tok_l)
-                    if len(key) < 3:
-                        continue
-                    groups[key][tok_l] += 1
-                    st = stats[(key, tok_l)]
-                    st.count += 1
-                    if line_has_nga:
-                        st.tib_nga_lines += 1
-                    if line_has_nya:
-                        st.tib_nya_lines += 1
-                    b_ie, not_ie = n_pos_counts(tok_l)
-                    st.n_before_ie_count += b_ie
-                    st.n_not_before_ie_count += not_ie
-                    if not st.example:
-                        st.example = line
+    groups: defaultdict[str, Counter[str]] = defaultdict(Counter)
+    stats: defaultdict[tuple[str, str], TokenStats] = defaultdict(TokenStats)
+    paths = [Path(x) for x in args.inputs]
+    jobs = max(1, min(args.jobs, len(paths)))
+    if jobs == 1:
+        for p in paths:
+            scan_file(p, groups, stats)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            # Fold per-file results in input order so token order and examples match a serial scan.
+            for file_groups, file_stats in pool.map(scan_file, paths):
+                for key, c in file_groups.items():
+                    groups[key].update(c)
+                for sk, file_st in file_stats.items():
+                    stats[sk].merge(file_st)
 
     out = Path(args.out)
     out.parent.mkdir(parents=True, exist_ok=True)
@@ -197,17 +245,16 @@ def main() -> None:
             total = sum(c.values())
             if total < args.min_group_total or len(c) < 2:
                 continue
+            # Each token's score is used for ranking and again in every row it appears in.
+            scores = {tok: token_weighted_score(tok, stats[(key, tok)]) for tok in c}
             if args.mode == "general":
-                ranked = sorted(
-                    c.keys(),
-                    key=lambda tok: (token_weighted_score(tok, stats[(key, tok)]), stats[(key, tok)].count),
-                    reverse=True,
-                )
+                ranked = sorted(c.keys(), key=lambda tok: (scores[tok], stats[(key, tok)].count), reverse=True)
                 best = ranked[0]
                 best_st = stats[(key, best)]
+                best_score = scores[best]
                 for cand in ranked[1:]:
                     cand_st = stats[(key, cand)]
-                    if token_weighted_score(best, best_st) <= token_weighted_score(cand, cand_st):
+                    if best_score <= scores[cand]:
                         continue
                     w.writerow(
                         [
@@ -217,8 +264,8 @@ def main() -> None:
                             cand_st.count,
                             best_st.count,
                             total,
-                            f"{token_weighted_score(cand, cand_st):.2f}",
-                            f"{token_weighted_score(best, best_st):.2f}",
+                            f"{scores[cand]:.2f}",
+                            f"{best_score:.2f}",
                             cand_st.tib_nga_lines,
                             cand_st.tib_nya_lines,
                             cand_st.n_before_ie_count,
@@ -235,7 +282,7 @@ def main() -> None:
                     continue
                 target = max(
                     dotted,
-                    key=lambda tok: (token_weighted_score(tok, stats[(key, tok)]), stats[(key, tok)].count),
+                    key=lambda tok: (scores[tok], stats[(key, tok)].count),
                 )
                 target_st = stats[(key, target)]
                 if target_st.tib_nga_lines < args.min_nga_evidence:
@@ -256,8 +303,8 @@ def main() -> None:
                             cand_st.count,
                             target_st.count,
                             total,
-                            f"{token_weighted_score(cand, cand_st):.2f}",
-                            f"{token_weighted_score(target, target_st):.2f}",
+                            f"{scores[cand]:.2f}",
+                            f"{scores[target]:.2f}",
                             cand_st.tib_nga_lines,
                             cand_st.tib_nya_lines,
                             cand_st.n_before_ie_count,
@@ -8,16 +8,36 @@ from __future__ import annotations
 
 import argparse
 import csv
-import re
 from pathlib import Path
-
-TIB_RE = re.compile(r"[\u0F00-\u0FFF]")
+from typing import Iterator
+
+# U+0F00..U+0FFF encode as E0 BC 80 .. E0 BF BF; E0 is always a lead byte, so
+# each of these two-byte prefixes marks exactly one Tibetan character.
+TIB_UTF8_PREFIXES = (b"\xe0\xbc", b"\xe0\xbd", b"\xe0\xbe", b"\xe0\xbf")
+
+
+def iter_pages(path: str, chunk_size: int = 1 << 20) -> Iterator[str]:
+    # Copy of merge_twopass_select_pages.iter_pages; the scripts stay standalone, so keep
+    # the two in sync.
+    with open(path, errors="replace") as f:
+        parts: list[str] = []
+        while chunk := f.read(chunk_size):
+            pieces = chunk.split("\f")
+            if len(pieces) == 1:
+                parts.append(chunk)
+                continue
+            parts.append(pieces[0])
+            yield "".join(parts)
+            yield from pieces[1:-1]
+            parts = [pieces[-1]]
+        yield "".join(parts)
 
 
 def page_metrics(text: str) -> dict[str, int]:
     lines = text.count("\n") + (1 if text else 0)
     chars = len(text)
-    tib = len(TIB_RE.findall(text))
+    data = text.encode("utf-8")
+    tib = sum(data.count(prefix) for prefix in TIB_UTF8_PREFIXES)
     return {"lines": lines, "chars": chars, "tib": tib}
 
 
@@ -32,10 +52,7 @@ def main() -> int:
     p.add_argument("--min-tib-gain", type=float, default=1.05, help="Minimum B/A Tibetan char multiplier")
     args = p.parse_args()
 
-    a_pages = Path(args.pass_a).read_text(errors="replace").split("\f")
-    b_pages = Path(args.pass_b).read_text(errors="replace").split("\f")
-    n = min(len(a_pages), len(b_pages))
-
+    n = 0
     Path(args.csv).parent.mkdir(parents=True, exist_ok=True)
     b_candidates: list[int] = []
     review_pages: list[int] = []
@@ -58,9 +75,11 @@ def main() -> int:
             ]
         )
 
-        for i in range(n):
-            am = page_metrics(a_pages[i])
-            bm = page_metrics(b_pages[i])
+        # Both passes are read page by page, stopping at the shorter one.
+        for i, (a_page, b_page) in enumerate(zip(iter_pages(args.pass_a), iter_pages(args.pass_b))):
+            n += 1
+            am = page_metrics(a_page)
+            bm = page_metrics(b_page)
             line_ratio = (bm["lines"] / am["lines"]) if am["lines"] else 1.0
             char_ratio = (bm["chars"] / am["chars"]) if am["chars"] else 1.0
             tib_ratio = (bm["tib"] / am["tib"]) if am["tib"] else (2.0 if bm["tib"] else 1.0)
@@ -3,6 +3,7 @@ import argparse
 import os
 import re
 import subprocess
+import sys
 from pathlib import Path
 
 def parse_pages(s, max_page=None):
@@ -31,18 +32,46 @@ def pdf_page_count(pdf_path):
     m = re.search(r"^Pages:\s+(\d+)", out, re.MULTILINE)
     return int(m.group(1)) if m else None
 
-TIB_RANGE = re.compile(r"[\u0F00-\u0FFF]")
+# Same table as qa_twopass_page_metrics.TIB_UTF8_PREFIXES; the scripts stay standalone,
+# so keep the two in sync.
+TIB_UTF8_PREFIXES = (b"\xe0\xbc", b"\xe0\xbd", b"\xe0\xbe", b"\xe0\xbf")
+ASCII_NON_LETTERS = bytes(b for b in range(128) if not chr(b).isalpha())
 
 def analyze_text(text):
     total = len(text)
-    tib = len(TIB_RANGE.findall(text))
-    latin = sum(c.isalpha() and ord(c) < 128 for c in text)
+    data = text.encode("utf-8")
+    tib = sum(data.count(prefix) for prefix in TIB_UTF8_PREFIXES)
+    # ASCII letters are the bytes left after dropping non-ASCII and every other ASCII byte.
+    latin = len(text.encode("ascii", "ignore").translate(None, ASCII_NON_LETTERS))
     return total, tib, latin
 
 def extract_page_text(pdf_path, page, out_txt):
     cmd = ["pdftotext", "-f", str(page), "-l", str(page), "-layout", pdf_path, out_txt]
     subprocess.check_call(cmd)
 
+def contiguous_runs(pages):
+    runs = []
+    for p in pages:
+        if runs and p == runs[-1][1] + 1:
+            runs[-1][1] = p
+        else:
+            runs.append([p, p])
+    return runs
+
+def extract_page_range(pdf_path, first, last):
+    # One pdftotext call per run of pages; it ends every page with a form feed,
+    # so the chunks are exactly what a single-page call would have written.
+    # Returns None if the run could not be extracted whole (e.g. it runs past the last page);
+    # its warnings are then dropped, since the per-page fallback reports them again.
+    cmd = ["pdftotext", "-f", str(first), "-l", str(last), "-layout", pdf_path, "-"]
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    chunks = proc.stdout.split(b"\f")
+    if proc.returncode != 0 or len(chunks) != last - first + 2:
+        return None
+    sys.stderr.buffer.write(proc.stderr)
+    sys.stderr.flush()
+    return [chunk + b"\f" for chunk in chunks[:-1]]
+
 def main():
     ap = argparse.ArgumentParser(description="Sample PDF pages and assess text layer quality.")
     ap.add_argument("pdf", help="Path to PDF")
@@ -64,12 +93,19 @@ def main():
         print(f"Pages: {max_page}")
     print("page\tchars\ttib\tlatin\tfile")
 
-    for p in pages:
-        out_txt = outdir / f"{Path(pdf_path).stem}_p{p:04d}.txt"
-        extract_page_text(pdf_path, p, str(out_txt))
-        text = out_txt.read_text(errors="ignore")
-        total, tib, latin = analyze_text(text)
-        print(f"{p}\t{total}\t{tib}\t{latin}\t{out_txt}")
+    for first, last in contiguous_runs(pages):
+        # Runs that fail as a whole fall back to page-by-page extraction, which reports
+        # the offending page as before.
+        run_pages = extract_page_range(pdf_path, first, last) if last > first else None
+        for i, p in enumerate(range(first, last + 1)):
+            out_txt = outdir / f"{Path(pdf_path).stem}_p{p:04d}.txt"
+            if run_pages is None:
+                extract_page_text(pdf_path, p, str(out_txt))
+            else:
+                out_txt.write_bytes(run_pages[i])
+            text = out_txt.read_text(errors="ignore")
+            total, tib, latin = analyze_text(text)
+            print(f"{p}\t{total}\t{tib}\t{latin}\t{out_txt}")
 
 if __name__ == "__main__":
     main()
@@ -3,13 +3,20 @@ from __future__ import annotations
 
 import argparse
 import csv
+import os
 import re
 import unicodedata
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
 from pathlib import Path
 
 TIB_RE = re.compile(r"[\u0F00-\u0FFF]")
-LATIN_TOKEN_RE = re.compile(r"[A-Za-zĀāĪīŪūṚṛṜṝḶḷḸḹṄṅÑñṬṭḌḍṆṇŚśṢṣḤḥṂṃṀṁŹźÄÖÜäöüßışŞņŅãÃ]+(?:-[A-Za-zĀāĪīŪūṚṛṜṝḶḷḸḹṄṅÑñṬṭḌḍṆṇŚśṢṣḤḥṂṃṀṁŹźÄÖÜäöüßışŞņŅãÃ]+)*")
+# Must stay in step with apply_approved_rewrites.LATIN_CLASS so approved rewrites
+# see the same token boundaries this report grouped on.
+LATIN_CLASS = r"[A-Za-zĀāĪīŪūṚṛṜṝḶḷḸḹṄṅÑñṬṭḌḍṆṇŚśṢṣḤḥṂṃṀṁŹźÄÖÜäöüßışŞņŅãÃ]"
+LATIN_TOKEN_RE = re.compile(rf"{LATIN_CLASS}+(?:-{LATIN_CLASS}+)*")
 SKT_MARKER_RE = re.compile(r"\b(?:skt|skr|sanskrit|iast)\.?\b", re.IGNORECASE)
 BIB_MARKER_RE = re.compile(r"\b(?:ed\.?:|hrsg\.|pp\.|vol\.|no\.|nr\.|ibid\.|trans\.|tr\.)\b", re.IGNORECASE)
 YEAR_RE = re.compile(r"\b(?:1[89]\d{2}|20\d{2})\b")
@@ -18,6 +25,13 @@ SYMBOL_OR_DIGIT_RE = re.compile(r"[\d€£¬¥¢§¤@#%^&*_=/\\|~]")
 IAST_RE = re.compile(r"[āīūṛṝḷḹṅñṭḍṇśṣḥṃṁźĀĪŪṚṜḶḸṄÑṬḌṆŚṢḤṂṀŹ]")
 GERMAN_RE = re.compile(r"[äöüÄÖÜß]")
 TITLE_NAME_RE = re.compile(r"^[A-ZÄÖÜ][A-Za-zÄÖÜäöüß]+(?:-[A-ZÄÖÜ][A-Za-zÄÖÜäöüß]+)*$")
+DIACRITIC_RE = re.compile(r"[āīūṛṝḷḹṅñṭḍṇśṣḥṃṁź]")
+GERMAN_UMLAUT_RE = re.compile(r"[äöüÄÖÜ]")
+TRANSLIT_SHAPE_RE = re.compile(r"[a-zāīūṛṝḷḹṅñṭḍṇśṣḥṃṁź'’\-]+")
+TRANSLIT_TOKEN_RE = re.compile(r"[A-Za-zāīūṛṝḷḹṅñṭḍṇśṣḥṃṁź'’\-]+")
+CLUSTER_RE = re.compile(r"(kh|tsh|ts|ph|th|dh|bh|dz|rdz|ng|ny)")
+NAME_CAP_RE = re.compile(r"^[A-ZÄÖÜ][a-zäöüß]+(?:-[A-ZÄÖÜ][a-zäöüß]+)?$")
+WS_RUN_RE = re.compile(r"\s+")
 GERMAN_STOPWORDS = {
     "der",
     "die",
@@ -129,65 +143,74 @@ CANON_MAP = str.maketrans(
     }
 )
 
+# canon_key's whole character mapping in one table: OCR confusables resolved through
+# CANON_MAP (so e.g. ñ -> ṅ -> n), and apostrophes/hyphens dropped.
+CANON_KEY_TRANS = {
+    **CANON_MAP,
+    **{ord(src): dst.translate(CANON_MAP) for src, dst in CONFUSABLE_FROM.items()},
+    **{ord(ch): None for ch in "'’-"},
+}
+
 
 def normalize_line(s: str) -> str:
-    s = unicodedata.normalize("NFC", s)
     s = s.replace("\f", " ")
-    return re.sub(r"\s+", " ", s.strip())
+    return WS_RUN_RE.sub(" ", s.strip())
 
 
 def line_category(s: str) -> str:
-    has_tib = bool(TIB_RE.search(s))
-    has_roman_cues = bool(ROMAN_CUE_RE.search(s))
-    bib = bool(BIB_MARKER_RE.search(s) or len(YEAR_RE.findall(s)) >= 2)
-    if bib:
+    # Checks run in priority order and stop at the first decisive one; the
+    # roman-cue scan is the most expensive and only matters on Tibetan lines.
+    if BIB_MARKER_RE.search(s) or len(YEAR_RE.findall(s)) >= 2:
         return "names_citations"
-    if has_tib and has_roman_cues:
+    if TIB_RE.search(s) and ROMAN_CUE_RE.search(s):
         return "tibetan_translit"
     if SKT_MARKER_RE.search(s):
         return "tibetan_translit"
     return "german_or_other"
 
 
-def token_category(line: str, tok: str, start: int, end: int, line_cat: str) -> str:
+@lru_cache(maxsize=1 << 18)
+def token_shape(tok: str) -> tuple[bool, bool, bool]:
+    """Context-free flags for token_category: (stopword, translit_cue, name_like)."""
+    tok_l = tok.lower()
+    is_stopword = tok_l in GERMAN_STOPWORDS
+    translit_cue = bool(
+        ROMAN_CUE_RE.search(tok)
+        or IAST_RE.search(tok)
+        or (
+            TRANSLIT_SHAPE_RE.fullmatch(tok_l)
+            and (CLUSTER_RE.search(tok_l) or "'" in tok_l or "’" in tok_l)
+        )
+    )
+    name_like = bool(TITLE_NAME_RE.fullmatch(tok)) and not GERMAN_RE.search(tok)
+    return is_stopword, translit_cue, name_like
+
+
+def token_category(line: str, tok: str, start: int, end: int, line_cat: str, line_has_tib: bool = True) -> str:
     # Bibliographic context dominates for citation/name cleanup.
     if line_cat == "names_citations":
         return "names_citations"
 
-    window_l = max(0, start - 24)
-    window_r = min(len(line), end + 24)
-    window = line[window_l:window_r]
-    near_tibetan = bool(TIB_RE.search(window))
-    tok_has_roman = bool(ROMAN_CUE_RE.search(tok))
-    tok_has_iast = bool(IAST_RE.search(tok))
-    tok_is_title_name = bool(TITLE_NAME_RE.fullmatch(tok))
-    tok_l = tok.lower()
-    maybe_translit_shape = bool(re.fullmatch(r"[a-zāīūṛṝḷḹṅñṭḍṇśṣḥṃṁź'’\-]+", tok_l))
-    has_cluster = bool(re.search(r"(kh|tsh|ts|ph|th|dh|bh|dz|rdz|ng|ny)", tok_l))
+    is_stopword, translit_cue, name_like = token_shape(tok)
 
-    # Transliteration bucket: local Tibetan neighborhood plus romanization cues.
-    if near_tibetan and tok_l in GERMAN_STOPWORDS:
-        return "german_or_other"
-    if near_tibetan and (tok_has_roman or tok_has_iast):
-        return "tibetan_translit"
-    if near_tibetan and maybe_translit_shape and (has_cluster or "'" in tok_l or "’" in tok_l):
-        return "tibetan_translit"
+    # Transliteration bucket: local Tibetan neighborhood plus romanization cues. Most
+    # lines have no Tibetan at all; callers that know that can skip the window scan.
+    if (is_stopword or translit_cue) and line_has_tib and TIB_RE.search(line, max(0, start - 24), end + 24):
+        return "german_or_other" if is_stopword else "tibetan_translit"
 
     # Name-like tokens outside dictionary transliteration are better treated as citation/name.
-    if tok_is_title_name and not GERMAN_RE.search(tok):
+    if name_like:
         return "names_citations"
 
     return "german_or_other"
 
 
+@lru_cache(maxsize=1 << 18)
 def canon_key(tok: str) -> str:
-    t = unicodedata.normalize("NFC", tok)
-    t = "".join(CONFUSABLE_FROM.get(ch, ch) for ch in t)
-    t = t.translate(CANON_MAP).lower()
-    t = t.replace("'", "").replace("’", "").replace("-", "")
-    return t
+    return tok.translate(CANON_KEY_TRANS).lower()
 
 
+@lru_cache(maxsize=1 << 18)
 def token_quality_score(tok: str, category: str) -> int:
     score = 0
     if SYMBOL_OR_DIGIT_RE.search(tok):
@@ -199,20 +222,20 @@ def token_quality_score(tok: str, category: str) -> int:
     if "ù" in tok or "¬" in tok:
         score -= 12
     if category == "tibetan_translit":
-        score += 2 * len(re.findall(r"[āīūṛṝḷḹṅñṭḍṇśṣḥṃṁź]", tok))
-        if re.fullmatch(r"[A-Za-zāīūṛṝḷḹṅñṭḍṇśṣḥṃṁź'’\-]+", tok):
+        score += 2 * len(DIACRITIC_RE.findall(tok))
+        if TRANSLIT_TOKEN_RE.fullmatch(tok):
             score += 6
-        if re.search(r"[äöüÄÖÜ]", tok):
+        if GERMAN_UMLAUT_RE.search(tok):
             score -= 6
     elif category == "names_citations":
-        if re.match(r"^[A-ZÄÖÜ][a-zäöüß]+(?:-[A-ZÄÖÜ][a-zäöüß]+)?$", tok):
+        if NAME_CAP_RE.match(tok):
             score += 5
-        if re.search(r"[āīūṛṝḷḹṅñṭḍṇśṣḥṃṁź]", tok):
+        if DIACRITIC_RE.search(tok):
             score += 1
     else:
-        if re.search(r"[äöüÄÖÜß]", tok):
+        if GERMAN_RE.search(tok):
             score += 3
-        if re.search(r"[āīūṛṝḷḹṅñṭḍṇśṣḥṃṁź]", tok):
+        if DIACRITIC_RE.search(tok):
             score -= 1
     return score
 
@@ -243,6 +266,59 @@ def conservative_pair_allowed(src: str, dst: str, category: str) -> bool:
     return diffs <= 2
 
 
+def iter_nfc_lines(path: Path):
+    # Stream the file instead of holding it (and a split copy) in memory. Each physical
+    # line is NFC-normalized on its own, which matches normalizing the whole text since
+    # line breaks are starters; splitlines() then also breaks on the other separators
+    # (\x0b, \x1c, \x85, \u2028, ...) exactly as splitting the whole text did.
+    with path.open(encoding="utf-8", errors="replace", buffering=1 << 20) as fh:
+        for physical_line in fh:
+            yield from unicodedata.normalize("NFC", physical_line).splitlines()
+
+
+def open_tsv(stack: ExitStack, path: Path):
+    return csv.writer(stack.enter_context(path.open("w", encoding="utf-8", newline="")), delimiter="\t")
+
+
+def scan_file(
+    path: Path,
+    groups: defaultdict[tuple[str, str], Counter[str]] | None = None,
+    examples: defaultdict[tuple[str, str], dict[str, str]] | None = None,
+) -> tuple[defaultdict[tuple[str, str], Counter[str]], defaultdict[tuple[str, str], dict[str, str]]]:
+    """Add one file's token counts and first example lines per (category, canon_key) group.
+
+    Accumulates into `groups`/`examples` when given, otherwise into fresh ones.
+    """
+    if groups is None:
+        groups = defaultdict(Counter)
+    # First example line per token, nested under its group key so the hot loop
+    # reuses the group tuple instead of building and hashing a second key.
+    if examples is None:
+        examples = defaultdict(dict)
+
+    # Lines arrive NFC-normalized; tokens sliced from them need no further normalizing.
+    for raw_line in iter_nfc_lines(path):
+        line = normalize_line(raw_line)
+        if not line:
+            continue
+        line_cat = line_category(line)
+        line_has_tib = line_cat != "names_citations" and TIB_RE.search(line) is not None
+        for m in LATIN_TOKEN_RE.finditer(line):
+            tok = m.group(0)
+            if len(tok) < 3:
+                continue
+            cat = token_category(line, tok, m.start(), m.end(), line_cat, line_has_tib)
+            key = canon_key(tok)
+            if len(key) < 3:
+                continue
+            gk = (cat, key)
+            groups[gk][tok] += 1
+            group_examples = examples[gk]
+            if tok not in group_examples:
+                group_examples[tok] = line
+    return groups, examples
+
+
 def main() -> None:
     ap = argparse.ArgumentParser(description="Find high-confidence OCR variant groups and conservative rewrite candidates.")
     ap.add_argument("inputs", nargs="+", help="Merged text files.")
@@ -250,42 +326,39 @@ def main() -> None:
     ap.add_argument("--min-group-total", type=int, default=5)
     ap.add_argument("--min-winner-share", type=float, default=0.72)
     ap.add_argument("--min-winner-gap", type=float, default=0.20)
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Input files scanned in parallel.")
     args = ap.parse_args()
 
     outdir = Path(args.outdir)
     outdir.mkdir(parents=True, exist_ok=True)
 
-    groups: dict[tuple[str, str], Counter[str]] = defaultdict(Counter)
-    examples: dict[tuple[str, str, str], str] = {}
-
-    for p in [Path(x) for x in args.inputs]:
-        text = p.read_text(encoding="utf-8", errors="replace")
-        for raw_line in text.splitlines():
-            line = normalize_line(raw_line)
-            if not line:
-                continue
-            line_cat = line_category(line)
-            for m in LATIN_TOKEN_RE.finditer(line):
-                tok = m.group(0)
-                if len(tok) < 3:
-                    continue
-                cat = token_category(line, tok, m.start(), m.end(), line_cat)
-                key = canon_key(tok)
-                if len(key) < 3:
-                    continue
-                gk = (cat, key)
-                groups[gk][tok] += 1
-                exk = (cat, key, tok)
-                if exk not in examples:
-                    examples[exk] = line
+    groups: defaultdict[tuple[str, str], Counter[str]] = defaultdict(Counter)
+    examples: defaultdict[tuple[str, str], dict[str, str]] = defaultdict(dict)
+    paths = [Path(x) for x in args.inputs]
+    jobs = max(1, min(args.jobs, len(paths)))
+    if jobs == 1:
+        for p in paths:
+            scan_file(p, groups, examples)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            # Fold per-file results in input order, so first-seen token order (which breaks
+            # count ties below) and the first example per token match a serial scan.
+            for file_groups, file_examples in pool.map(scan_file, paths):
+                for gk, c in file_groups.items():
+                    groups[gk].update(c)
+                    group_examples = examples[gk]
+                    for tok, line in file_examples[gk].items():
+                        group_examples.setdefault(tok, line)
 
     variants_path = outdir / "variant_groups.tsv"
     rewrites_path = outdir / "conservative_rewrite_candidates.tsv"
     review_path = outdir / "manual_review_candidates.tsv"
 
-    with variants_path.open("w", encoding="utf-8", newline="") as f:
-        w = csv.writer(f, delimiter="\t")
-        w.writerow(
+    with ExitStack() as stack:
+        variants_w = open_tsv(stack, variants_path)
+        rewrites_w = open_tsv(stack, rewrites_path)
+        review_w = open_tsv(stack, review_path)
+        variants_w.writerow(
             [
                 "category",
                 "canon_key",
@@ -297,27 +370,7 @@ def main() -> None:
                 "example",
             ]
         )
-        for (cat, key), c in sorted(groups.items()):
-            total = sum(c.values())
-            if total < args.min_group_total or len(c) < 2:
-                continue
-            for tok, cnt in c.most_common():
-                w.writerow(
-                    [
-                        cat,
-                        key,
-                        tok,
-                        cnt,
-                        total,
-                        f"{cnt/total:.4f}",
-                        token_quality_score(tok, cat),
-                        examples.get((cat, key, tok), ""),
-                    ]
-                )
-
-    with rewrites_path.open("w", encoding="utf-8", newline="") as f:
-        w = csv.writer(f, delimiter="\t")
-        w.writerow(
+        rewrites_w.writerow(
             [
                 "category",
                 "canon_key",
@@ -330,44 +383,7 @@ def main() -> None:
                 "confidence",
             ]
         )
-        for (cat, key), c in sorted(groups.items()):
-            total = sum(c.values())
-            if total < args.min_group_total or len(c) < 2:
-                continue
-            ranked = sorted(
-                c.items(),
-                key=lambda kv: (kv[1], token_quality_score(kv[0], cat)),
-                reverse=True,
-            )
-            winner, wcnt = ranked[0]
-            second_cnt = ranked[1][1] if len(ranked) > 1 else 0
-            share = wcnt / total
-            gap = (wcnt - second_cnt) / total if total else 0.0
-            if share < args.min_winner_share or gap < args.min_winner_gap:
-                continue
-            for loser, lcnt in ranked[1:]:
-                if loser == winner:
-                    continue
-                if not conservative_pair_allowed(loser, winner, cat):
-                    continue
-                conf = min(0.99, share + gap / 2.0)
-                w.writerow(
-                    [
-                        cat,
-                        key,
-                        loser,
-                        winner,
-                        lcnt,
-                        wcnt,
-                        f"{share:.4f}",
-                        f"{gap:.4f}",
-                        f"{conf:.4f}",
-                    ]
-                )
-
-    with review_path.open("w", encoding="utf-8", newline="") as f:
-        w = csv.writer(f, delimiter="\t")
-        w.writerow(
+        review_w.writerow(
             [
                 "category",
                 "canon_key",
@@ -382,31 +398,66 @@ def main() -> None:
                 "example",
             ]
         )
+
+        # One pass over the groups feeds all three reports; each file still gets its rows
+        # in sorted group order.
         for (cat, key), c in sorted(groups.items()):
             total = sum(c.values())
             if total < args.min_group_total or len(c) < 2:
                 continue
+            group_examples = examples[(cat, key)]
+
+            for tok, cnt in c.most_common():
+                variants_w.writerow(
+                    [
+                        cat,
+                        key,
+                        tok,
+                        cnt,
+                        total,
+                        f"{cnt/total:.4f}",
+                        token_quality_score(tok, cat),
+                        group_examples.get(tok, ""),
+                    ]
+                )
+
             ranked = sorted(
                 c.items(),
                 key=lambda kv: (kv[1], token_quality_score(kv[0], cat)),
                 reverse=True,
             )
             best, bcnt = ranked[0]
-            bshare = bcnt / total if total else 0.0
+            second_cnt = ranked[1][1] if len(ranked) > 1 else 0
+            share = bcnt / total
+            gap = (bcnt - second_cnt) / total if total else 0.0
+            rewrite = share >= args.min_winner_share and gap >= args.min_winner_gap
+            conf = min(0.99, share + gap / 2.0)
+            bq = token_quality_score(best, cat)
             for cand, ccnt in ranked[1:]:
                 if cand == best:
                     continue
-                cq = token_quality_score(cand, cat)
-                bq = token_quality_score(best, cat)
-                qdelta = bq - cq
                 conservative = conservative_pair_allowed(cand, best, cat)
-                if conservative and bshare >= args.min_winner_share:
+                if rewrite and conservative:
+                    rewrites_w.writerow(
+                        [
+                            cat,
+                            key,
+                            cand,
+                            best,
+                            ccnt,
+                            bcnt,
+                            f"{share:.4f}",
+                            f"{gap:.4f}",
+                            f"{conf:.4f}",
+                        ]
+                    )
+                if conservative and share >= args.min_winner_share:
                     risk = "low"
                 elif conservative:
                     risk = "medium"
                 else:
                     risk = "high"
-                w.writerow(
+                review_w.writerow(
                     [
                         cat,
                         key,
@@ -415,10 +466,10 @@ def main() -> None:
                         ccnt,
                         bcnt,
                         total,
-                        f"{bshare:.4f}",
-                        qdelta,
+                        f"{share:.4f}",
+                        bq - token_quality_score(cand, cat),
                         risk,
-                        examples.get((cat, key, cand), ""),
+                        group_examples.get(cand, ""),
                     ]
                 )
 
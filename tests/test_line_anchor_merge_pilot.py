@@ -0,0 +1,126 @@
+import importlib.util
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT_PATH = ROOT / "scripts" / "line_anchor_merge_pilot.py"
+SPEC = importlib.util.spec_from_file_location("line_anchor_merge_pilot", SCRIPT_PATH)
+if SPEC is None or SPEC.loader is None:
+    raise ImportError(f"Could not load line_anchor_merge_pilot module from {SCRIPT_PATH}")
+lam = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = lam
+SPEC.loader.exec_module(lam)
+
+
+class EnforceNgFromTibetanPrefixTests(unittest.TestCase):
+    def test_decomposed_umlaut_in_tail_does_not_duplicate_romanization(self) -> None:
+        # The tail is NFC-normalized before the rebuild; slicing the raw line by that
+        # shorter length used to repeat the first romanized letter ("RRa").
+        line = "ཀ་བཀྱག་ Ra bkeyag (74) Säulenbasis."
+        self.assertEqual(
+            lam.enforce_ng_from_tibetan_prefix(line),
+            "ཀ་བཀྱག་ Ra bkeyag (74) Säulenbasis.",
+        )
+
+    def test_extra_spaces_in_tail_do_not_duplicate_romanization(self) -> None:
+        self.assertEqual(
+            lam.enforce_ng_from_tibetan_prefix("ཀང་  kan  12: kha"),
+            "ཀང་  kaṅ 12: kha",
+        )
+
+    def test_contextual_cleanup_keeps_single_romanized_initial(self) -> None:
+        page = ["ཀ་བཀྱག་ Ra bkeyag (74) Säulenbasis."]
+        zones = lam.page_line_zones(page)
+        self.assertEqual(
+            lam.post_cleanup_contextual(zones, 0, page[0]),
+            "ཀ་བཀྱག་ Ra bkeyag Säulenbasis.",
+        )
+
+
+class EarlyAcceptSimilarityTests(unittest.TestCase):
+    # Pass B text per crop variant: line 1 is accepted on its first variant but a later
+    # variant has more diacritics; line 2 is only accepted on its second variant.
+    PASS_A_LINES = ["dharma kaya", "bodhi sattva"]
+    PASS_B_TEXT = {
+        "p0001_l0001_raw.png": "dharmā kāya",
+        "p0001_l0001_auto.png": "dhārmā kāyā",
+        "p0001_l0001_bw180.png": "dharma kaya",
+        "p0001_l0002_raw.png": "bodhi sattva",
+        "p0001_l0002_auto.png": "bodhi sattvā",
+        "p0001_l0002_bw180.png": "bodhī sattvā",
+    }
+
+    def run_page(self, early_accept_similarity: float) -> tuple[list[dict[str, object]], list[str]]:
+        ocr_calls: list[str] = []
+
+        def fake_pass_a(page: int, dpi: int, lang: str, psm: int, pages_dir: Path) -> tuple[Path, list[dict[str, object]]]:
+            lines = [{"bbox": (0, 20 * i, 100, 20 * i + 10), "text": text} for i, text in enumerate(self.PASS_A_LINES)]
+            return pages_dir / f"p{page:04d}.png", lines
+
+        def fake_variants(raw_crop: Path, img: object, variants: tuple[str, ...]) -> list[tuple[str, Path]]:
+            return [(name, raw_crop.with_name(f"{raw_crop.stem}_{name}.png")) for name in variants]
+
+        def fake_ocr(images: list[Path], lang: str, psm: int, dpi: int, timeout_sec: float, list_path: Path) -> list[str]:
+            ocr_calls.extend(image.name for image in images)
+            return [self.PASS_B_TEXT[image.name] for image in images]
+
+        with TemporaryDirectory() as td, mock.patch.multiple(
+            lam,
+            render_pages_png=mock.DEFAULT,
+            open_page_image=mock.DEFAULT,
+            crop_image=mock.DEFAULT,
+            ocr_page_pass_a=fake_pass_a,
+            make_crop_variants=fake_variants,
+            image_digest=lambda path: path.name.encode(),
+            run_tesseract_batch_txt=fake_ocr,
+        ):
+            settings = lam.PageRunSettings(
+                pdf=Path(td) / "fixture.pdf",
+                pages_dir=Path(td),
+                dpi=300,
+                lang_a="eng",
+                psm_a=6,
+                lang_b="eng",
+                psm_b_values=(7,),
+                psm_b_values_tib=(7,),
+                crop_variants=("raw", "auto", "bw180"),
+                candidate_mode="all_latin",
+                line_timeout_sec=10.0,
+                min_similarity=0.5,
+                min_similarity_diacritic_only=0.5,
+                min_similarity_tibetan_anchor=0.5,
+                early_accept_similarity=early_accept_similarity,
+                jobs=1,
+                anomaly_report=False,
+                dehyphenate_wrap=False,
+            )
+            (result,) = lam.process_pages([1], settings)
+        return result.audit_rows, ocr_calls
+
+    def test_zero_scores_every_crop_variant(self) -> None:
+        rows, ocr_calls = self.run_page(0.0)
+        self.assertEqual(sorted(ocr_calls), sorted(self.PASS_B_TEXT))
+        self.assertEqual([row["b_text"] for row in rows], ["dhārmā kāyā", "bodhī sattvā"])
+        self.assertEqual([row["b_source"] for row in rows], ["auto_psm7", "bw180_psm7"])
+        # A threshold no candidate can reach walks the variants one at a time but must
+        # end with the same audit rows as scoring everything at once.
+        unreachable_rows, _ = self.run_page(1.01)
+        self.assertEqual(unreachable_rows, rows)
+
+    def test_accepted_line_is_scored_on_its_first_variants_only(self) -> None:
+        rows, ocr_calls = self.run_page(0.8)
+        self.assertEqual(
+            ocr_calls,
+            ["p0001_l0001_raw.png", "p0001_l0002_raw.png", "p0001_l0002_auto.png"],
+        )
+        self.assertEqual([row["b_text"] for row in rows], ["dharmā kāya", "bodhi sattvā"])
+        self.assertEqual([row["b_source"] for row in rows], ["raw_psm7", "auto_psm7"])
+        self.assertEqual([row["replaced"] for row in rows], [1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()